@@ -2,6 +2,15 @@
 
 __author__ = "Mithil Poojary"
 
-from mitype import _version
 
-__version__ = _version.get_versions()["version"]
+def __getattr__(name):
+    """Resolve `__version__` on first access.
+
+    Computing the version may run git in source checkouts, so it is kept
+    out of the import of the package.
+    """
+    if name == "__version__":
+        from mitype import _version
+
+        return _version.get_versions()["version"]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,6 +1,20 @@
 """Mitype."""
 
-from mitype.app import App
+from mitype.commandline import handle_informational_arguments, parse_arguments
+
+
+def main():
+    """Run mitype.
+
+    Options which only print information are handled before the typing
+    test and its dependencies are imported.
+    """
+    handle_informational_arguments(parse_arguments())
+
+    from mitype.app import App
 
-if __name__ == "__main__":
     App()
+
+
+if __name__ == "__main__":
+    main()
@@ -3,17 +3,13 @@
 import curses
 import os
 import sys
-import time
-import webbrowser
 
-import mitype.signals
+from mitype import timer
 from mitype.calculations import (
     accuracy,
-    first_index_at_which_strings_differ,
-    get_space_count_after_ith_word,
-    number_of_lines_to_fit_text_in_window,
+    consecutive_runs,
     speed_in_wpm,
-    word_wrap,
+    squash_whitespace,
 )
 from mitype.commandline import load_from_database, resolve_commandline_arguments
 from mitype.history import save_history
@@ -23,15 +19,25 @@ from mitype.keycheck import (
     is_ctrl_backspace,
     is_ctrl_c,
     is_ctrl_t,
+    is_down_arrow_key,
     is_enter,
     is_escape,
     is_left_arrow_key,
     is_resize,
     is_right_arrow_key,
     is_tab,
+    is_up_arrow_key,
     is_valid_initial_key,
 )
-from mitype.timer import get_elapsed_minutes_since_first_keypress
+from mitype.keystrokes import KeystrokeLog
+from mitype.layout import get_layout
+from mitype.prefetch import Prefetcher, prepare_text
+from mitype.replay import REPLAY_SEEK_STEP, ReplayScheduler
+from mitype.signals import install_signal_handlers
+from mitype.state import TypingState
+
+# Interval at which realtime speed is printed during a test
+REFRESH_INTERVAL = 250 * timer.NANOSECONDS_PER_MILLISECOND
 
 
 class App:
@@ -40,29 +46,30 @@ class App:
     def __init__(self):
         """Initialize the application class."""
         # Start the parser
-        self.text, self.text_id = resolve_commandline_arguments()
-        self.tokens = self.text.split()
+        text, self.text_id = resolve_commandline_arguments()
 
         # Squash multiple spaces, tabs, newlines to single space
-        self.text = " ".join(self.tokens)
-        self.text_backup = self.text
+        # Kept to wrap text again when window is resized
+        self.text_backup = squash_whitespace(text)
+        # Raw text is not needed during the session
+        del text
+        self.text = self.text_backup
 
-        # Current typed word and entire string
-        self.current_word = ""
-        self.current_string = ""
+        # Current typed word, entire string and mismatch tracking
+        self.state = TypingState(self.text)
 
         self.key = ""
         # First valid key press
         self.first_key_pressed = False
-        # Stores keypress, time tuple
-        self.key_strokes = []
-
-        self.mistyped_keys = []
+        # Stores time (in nanoseconds) and key of each keypress
+        self.key_strokes = KeystrokeLog()
 
         # Time at which test started
         self.start_time = 0
         # Time at which test ended
         self.end_time = 0
+        # Time at which realtime stats are to be printed next
+        self.next_refresh_time = 0
 
         # Keep track of the token index in text
         self.token_index = 0
@@ -73,12 +80,29 @@ class App:
         self.window_height = 0
         self.window_width = 0
 
+        # Wrapped text with offsets of its words and lines
+        # Built once window width is known
+        self.layout = None
         self.number_of_lines_to_print_text = 0
 
+        # Lines of text shown on screen, the rest is scrolled out of view
+        self.viewport_top = 0
+        self.viewport_height = 0
+        # Index of first character in view and one after the last one
+        self.visible_start = 0
+        self.visible_end = 0
+
+        # Portion of the screen painted by the last update
+        # Used to repaint only what changed on the next keystroke
+        self.printed_length = 0
+        self.printed_mismatch_index = 0
+        self.printed_word_length = 0
+        self.printed_wpm = ""
+
         # Restrict current word length to a limit
         # Used to highlight once the limit is reached
         # limit is set to the length of largest word in string + 5 for buffer
-        self.current_word_limit = len(max(self.tokens, key=len)) + 5
+        self.current_word_limit = 0
 
         self.test_complete = False
 
@@ -93,6 +117,9 @@ class App:
         # Color mapping
         self.Color = None
 
+        # Prepares neighbouring database texts in the background
+        self.prefetcher = Prefetcher()
+
         sys.stdout = sys.__stdout__
 
         # Set ESC delay to 0 (default 1 on linux)
@@ -112,40 +139,17 @@ class App:
         # Initialize windows
         self.initialize(win)
 
-        while True:
-            # Typing mode
-            key = self.keyinput(win)
-
-            if not self.first_key_pressed:
-                if is_escape(key) or is_ctrl_c(key):
-                    sys.exit(0)
-
-                if is_left_arrow_key(key):
-                    self.switch_text(win, -1)
-
-                if is_right_arrow_key(key):
-                    self.switch_text(win, 1)
+        install_signal_handlers()
 
-            # Test mode
-            if self.mode == 0:
-                self.typing_mode(win, key)
-
-            # Again mode
-            else:
-                # Tab to retry last test
-                if is_tab(key):
-                    win.clear()
-                    self.reset_test()
-                    self.setup_print(win)
-                    self.update_state(win)
+        while True:
+            # Sleeps until a key is pressed or realtime stats are due
+            keys = self.read_keys(win)
 
-                # Replay
-                if is_enter(key):
-                    self.replay(win)
+            # Keys typed in a burst are handled together and drawn once
+            if keys:
+                self.handle_keys(win, keys)
 
-                # Tweet result
-                if is_ctrl_t(key):
-                    self.share_result()
+            self.refresh_realtime_stats(win)
 
             # Refresh for changes to show up on window
             win.refresh()
@@ -159,7 +163,7 @@ class App:
         self.window_height, self.window_width = self.get_dimensions(win)
 
         # This works by adding extra spaces to the text where needed
-        self.text = word_wrap(self.text, self.window_width)
+        self.wrap_text()
 
         # Check if we can fit text in current window after adding word wrap
         self.screen_size_check()
@@ -185,13 +189,10 @@ class App:
 
         self.Color = Color
 
-        # This sets input to be a non-blocking call and will block for 100ms
-        # Returns -1 if no input found at the end of time
-        win.nodelay(True)
-        win.timeout(100)
-
         self.setup_print(win)
 
+        self.prefetch_neighbouring_texts()
+
     def setup_print(self, win):
         """Print setup text at beginning of each typing session.
 
@@ -203,68 +204,201 @@ class App:
 
         # Text is printed BOLD initially
         # It is dimmed as user types on top of it
-        win.addstr(2, 0, self.text, curses.A_BOLD)
+        self.scroll_viewport(0)
+        self.scroll_to_cursor()
+        self.print_visible_text(win)
+        self.printed_length = 0
+        self.printed_mismatch_index = 0
+        self.printed_word_length = 0
+        self.printed_wpm = ""
 
         self.print_realtime_wpm(win)
 
         # Set cursor position to beginning of text
         win.move(2, 0)
 
-    def clear_line(self, win, line):
-        """Clear a line on the window.
+    def update_state(self, win):
+        """Report on typing session results.
+
+        Only the cells that changed since the last call are painted again.
 
         Args:
             win (any): Curses window.
-            line (int): Line number.
         """
-        # Cursor advances to next cell after the character is printed
-        # This causes scroll with addstr on the last line which is disabled
-        # Hence using insstr instead
-        win.insstr(line, 0, " " * self.window_width)
+        self.print_current_word(win)
 
-    def update_state(self, win):
-        """Report on typing session results.
+        # Lines scrolled into view are printed whole
+        if self.scroll_to_cursor():
+            self.print_visible_text(win)
+            self.printed_length = self.printed_mismatch_index = self.visible_start
+        self.print_changed_text(win)
+
+        # End of test, all characters are typed out
+        if self.state.is_complete():
+            self.test_end(win)
+        else:
+            # Place cursor where next character is to be typed
+            self.move_cursor_to_text_index(win, self.state.typed_length())
+
+        win.refresh()
+
+    def print_current_word(self, win):
+        """Print the word being typed below the text.
+
+        Leftover characters of the previously printed word are blanked out.
 
         Args:
             win (any): Curses window.
         """
-        self.clear_line(win, self.number_of_lines_to_print_text)
-        self.clear_line(win, self.number_of_lines_to_print_text + 2)
-        self.clear_line(win, self.number_of_lines_to_print_text + 4)
+        current_word = self.state.current_word
+        padding = " " * max(0, self.printed_word_length - len(current_word))
 
         # Highlight in RED if word reaches the word limit length
-        if len(self.current_word) >= self.current_word_limit:
+        if len(current_word) >= self.current_word_limit:
             win.addstr(
                 self.number_of_lines_to_print_text,
                 0,
-                self.current_word,
+                current_word,
                 self.Color.RED,
             )
+            win.addstr(padding)
         else:
-            win.addstr(self.number_of_lines_to_print_text, 0, self.current_word)
+            win.addstr(self.number_of_lines_to_print_text, 0, current_word + padding)
 
-        # Text is printed BOLD initially
-        # It is dimmed as user types on top of it
-        win.addstr(2, 0, self.text, curses.A_BOLD)
-        win.addstr(2, 0, self.text[0 : len(self.current_string)], curses.A_DIM)
+        self.printed_word_length = len(current_word)
 
-        index = first_index_at_which_strings_differ(self.current_string, self.text)
-        # Check if difference was found
-        if index < len(self.current_string) <= len(self.text):
-            self.mistyped_keys.append(len(self.current_string) - 1)
+    def print_changed_text(self, win):
+        """Repaint cells of the text whose highlighting changed.
 
-        win.addstr(
-            2 + index // self.window_width,
-            index % self.window_width,
-            self.text[index : len(self.current_string)],
-            self.Color.RED,
+        Only the span between the previously painted and the current typing
+        position is repainted.
+
+        Args:
+            win (any): Curses window.
+        """
+        typed_length = min(self.state.typed_length(), len(self.text))
+        mismatch_index = self.state.mismatch_index
+
+        start = min(self.printed_length, typed_length)
+        if mismatch_index != self.printed_mismatch_index:
+            # Cells between the old and new first mismatch change colour
+            start = min(start, self.printed_mismatch_index, mismatch_index)
+        end = max(self.printed_length, typed_length)
+        self.print_text_runs(win, self.text_attribute_runs(start, end))
+
+        self.printed_length = typed_length
+        self.printed_mismatch_index = mismatch_index
+
+    def text_attribute_runs(self, start, end):
+        """Split a range of text into runs of cells sharing an attribute.
+
+        Typed characters are dimmed up to the first mismatch and coloured red
+        after it, untyped characters are bold.
+
+        Args:
+            start (int): Index of first character of the range.
+            end (int): Index after last character of the range.
+
+        Returns:
+            list: List of (start, end, attribute) tuples.
+        """
+        typed_length = min(self.state.typed_length(), len(self.text))
+        mismatch_index = self.state.mismatch_index
+
+        runs = (
+            (start, min(end, mismatch_index), curses.A_DIM),
+            (max(start, mismatch_index), min(end, typed_length), self.Color.RED),
+            (max(start, typed_length), end, curses.A_BOLD),
         )
+        return [run for run in runs if run[0] < run[1]]
 
-        # End of test, all characters are typed out
-        if index == len(self.text):
-            self.test_end(win)
+    def print_text_runs(self, win, runs):
+        """Print runs of text, each with a single call.
 
-        win.refresh()
+        Parts of runs scrolled out of view are skipped.
+
+        Args:
+            win (any): Curses window.
+            runs (list): List of (start, end, attribute) tuples.
+        """
+        for start, end, attribute in runs:
+            start = max(start, self.visible_start)
+            end = min(end, self.visible_end)
+            if start >= end:
+                continue
+            line, column = self.text_index_position(start)
+            win.addstr(line, column, self.text[start:end], attribute)
+
+    def scroll_viewport(self, top):
+        """Set the first line of text in view.
+
+        Args:
+            top (int): Index of line.
+        """
+        line_starts = self.layout.line_starts
+        end_line = top + self.viewport_height
+        self.viewport_top = top
+        self.visible_start = line_starts[top]
+        if end_line < len(line_starts):
+            self.visible_end = line_starts[end_line]
+        else:
+            self.visible_end = len(self.text)
+
+    def print_visible_text(self, win):
+        """Print lines of text in view as untyped text.
+
+        Args:
+            win (any): Curses window.
+        """
+        start, end = self.visible_start, self.visible_end
+        # Blank out what is left of longer lines printed before scrolling
+        visible_text = self.text[start:end].ljust(
+            self.viewport_height * self.window_width
+        )
+        win.addstr(2, 0, visible_text, curses.A_BOLD)
+
+    def scroll_to_cursor(self):
+        """Scroll text so that the line being typed is in view.
+
+        Returns:
+            bool: `True` if the lines in view changed.
+        """
+        index = self.state.typed_length()
+        if self.visible_start <= index < self.visible_end:
+            return False
+
+        last_line = len(self.layout.line_starts) - 1
+        line = min(self.layout.line_of(index), last_line)
+        if self.viewport_top <= line < self.viewport_top + self.viewport_height:
+            return False
+
+        # Keep the line above the cursor in view
+        context = 1 if self.viewport_height > 2 else 0
+        top = min(line - context, last_line + 1 - self.viewport_height)
+        self.scroll_viewport(max(0, top))
+        return True
+
+    def text_index_position(self, index):
+        """Get the cell displaying given character of text.
+
+        Args:
+            index (int): Index of character in text.
+
+        Returns:
+            (int, int): Tuple of line and column.
+        """
+        index = min(index, len(self.text))
+        line = index // self.window_width - self.viewport_top
+        return 2 + line, index % self.window_width
+
+    def move_cursor_to_text_index(self, win, index):
+        """Move cursor to the cell displaying given character of text.
+
+        Args:
+            win (any): Curses window.
+            index (int): Index of character in text.
+        """
+        win.move(*self.text_index_position(index))
 
     def test_end(self, win):
         """Trigger at the end of the test.
@@ -275,32 +409,27 @@ class App:
         Args:
             win (any): Curses window.
         """
-        # Highlight mistyped characters
-        for i in self.mistyped_keys:
-            win.addstr(
-                2 + i // self.window_width,
-                i % self.window_width,
-                self.text[i],
-                self.Color.RED,
-            )
+        # Highlight mistyped characters, one run of adjacent ones at a time
+        mistyped_runs = consecutive_runs(self.state.errors.positions())
+        self.print_text_runs(
+            win, [(start, end, self.Color.RED) for start, end in mistyped_runs]
+        )
 
         curses.curs_set(0)
 
         # Calculate stats at the end of the test
         if self.mode == 0:
-            self.current_speed_wpm = speed_in_wpm(self.tokens, self.start_time)
+            self.current_speed_wpm = speed_in_wpm(
+                self.layout.token_count(), self.start_time
+            )
             total_chars_in_text = len(self.text_backup)
             wrongly_typed_chars = self.total_chars_typed - total_chars_in_text
             self.accuracy = accuracy(self.total_chars_typed, wrongly_typed_chars)
-            self.time_taken = get_elapsed_minutes_since_first_keypress(self.start_time)
+            self.time_taken = timer.get_elapsed_minutes_since_first_keypress(
+                self.start_time
+            )
 
             self.mode = 1
-            # Find time difference between the key strokes
-            # The key_strokes list is storing the time at which the key is pressed
-            for index in range(len(self.key_strokes) - 1, 0, -1):
-                self.key_strokes[index][0] -= self.key_strokes[index - 1][0]
-
-            self.key_strokes[0][0] = 0
 
         win.addstr(self.number_of_lines_to_print_text, 0, " Your typing speed is ")
         win.addstr(" " + self.current_speed_wpm + " ", self.Color.MAGENTA)
@@ -336,9 +465,8 @@ class App:
         self.print_stats(win)
 
         self.first_key_pressed = False
-        self.end_time = time.time()
-        self.current_string = ""
-        self.current_word = ""
+        self.end_time = timer.now()
+        self.state.reset()
         self.token_index = 0
 
         self.start_time = 0
@@ -347,6 +475,119 @@ class App:
             save_history(self.text_id, self.current_speed_wpm, f"{self.accuracy:.2f}")
             self.test_complete = True
 
+    def read_keys(self, win):
+        """Wait for a key and read every key pending after it.
+
+        Outside of a test this waits for as long as it takes for a key to be
+        pressed. During a test the wait ends when realtime stats are due.
+
+        Args:
+            win (any): Curses window.
+
+        Returns:
+            list: List of (key, time in nanoseconds it was read) tuples, empty
+            if no key was pressed.
+        """
+        if self.is_test_running():
+            win.timeout(timer.milliseconds_until(self.next_refresh_time))
+        else:
+            win.timeout(-1)
+
+        key = self.keyinput(win)
+        if key == "":
+            return []
+        keys = [(key, timer.now())]
+
+        # Read without waiting until no more keys are buffered
+        win.timeout(0)
+        while True:
+            key = self.keyinput(win)
+            if key == "":
+                break
+            keys.append((key, timer.now()))
+
+        return keys
+
+    def is_test_running(self):
+        """Check if a typing test is in progress.
+
+        Returns:
+            bool: `True` once the first key of a test is pressed until it ends.
+        """
+        return self.first_key_pressed and self.mode == 0
+
+    def refresh_realtime_stats(self, win):
+        """Print realtime speed when it is due during a test.
+
+        Speed is refreshed at a fixed rate, whether keys are pressed or not,
+        which also limits how often it is printed while typing fast.
+
+        Args:
+            win (any): Curses window.
+        """
+        if not self.is_test_running():
+            return
+
+        current_time = timer.now()
+        if current_time < self.next_refresh_time:
+            return
+
+        while self.next_refresh_time <= current_time:
+            self.next_refresh_time += REFRESH_INTERVAL
+
+        self.print_realtime_wpm(win)
+        self.move_cursor_to_text_index(win, self.state.typed_length())
+
+    def handle_keys(self, win, keys):
+        """Respond to keys read together.
+
+        Keys are applied one by one to the typing test, which is drawn once
+        after all of them unless one of them ends the test.
+
+        Args:
+            win (any): Curses window.
+            keys (list): List of (key, time in nanoseconds) tuples.
+        """
+        typed = False
+        for key, timestamp in keys:
+            if not self.first_key_pressed:
+                if is_escape(key) or is_ctrl_c(key):
+                    sys.exit(0)
+
+                if is_left_arrow_key(key):
+                    self.switch_text(win, -1)
+
+                if is_right_arrow_key(key):
+                    self.switch_text(win, 1)
+
+            # Test mode
+            if self.mode == 0:
+                if self.type_key(win, key, timestamp):
+                    typed = True
+                    if self.state.is_complete():
+                        self.update_state(win)
+                        typed = False
+
+            # Again mode
+            else:
+                # Tab to retry last test
+                if is_tab(key):
+                    win.clear()
+                    self.reset_test()
+                    self.setup_print(win)
+                    self.update_state(win)
+
+                # Replay
+                if is_enter(key):
+                    self.replay(win)
+
+                # Tweet result
+                if is_ctrl_t(key):
+                    self.share_result()
+
+        if typed and self.mode == 0:
+            self.update_state(win)
+
     def typing_mode(self, win, key):
         """Start recording typing session progress.
 
@@ -354,22 +595,36 @@ class App:
             win (any): Curses window.
             key (str): First typed character of the session.
         """
+        if self.type_key(win, key, timer.now()):
+            self.update_state(win)
+            self.refresh_realtime_stats(win)
+
+    def type_key(self, win, key, timestamp):
+        """Apply a key to the typing session without drawing it.
+
+        Args:
+            win (any): Curses window.
+            key (str): Typed key.
+            timestamp (int): Time in nanoseconds at which key was read.
+
+        Returns:
+            bool: `True` if key was applied to the session.
+        """
         # Note start time when first valid key is pressed
         if not self.first_key_pressed and is_valid_initial_key(key):
-            self.start_time = time.time()
+            self.start_time = timestamp
+            self.next_refresh_time = timestamp + REFRESH_INTERVAL
             self.first_key_pressed = True
 
         if is_resize(key):
             self.resize(win)
 
         if not self.first_key_pressed:
-            return
-
-        self.key_strokes.append([time.time(), key])
-
-        self.print_realtime_wpm(win)
+            return False
 
-        self.key_printer(win, key)
+        self.key_strokes.append(timestamp, key)
+        self.process_key(win, key)
+        return True
 
     @staticmethod
     def keyinput(win):
@@ -393,8 +648,8 @@ class App:
         except curses.error:
             return ""
 
-    def key_printer(self, win, key):
-        """Print required key to terminal.
+    def process_key(self, win, key):
+        """Update typing session with given key without printing it.
 
         Args:
             win (any): Curses window object.
@@ -422,9 +677,9 @@ class App:
             self.erase_word()
 
         # Ignore spaces at the start of the word (Plover support)
-        elif key == " " and len(self.current_word) < self.current_word_limit:
+        elif key == " " and self.state.word_length() < self.current_word_limit:
             self.total_chars_typed += 1
-            if self.current_word != "":
+            if self.state.word_length():
                 self.check_word()
 
         elif is_valid_initial_key(key):
@@ -432,9 +687,6 @@ class App:
             self.appendkey(key)
             self.total_chars_typed += 1
 
-        # Update state of window
-        self.update_state(win)
-
     def resize(self, win):
         """Respond to window resize events.
 
@@ -444,7 +696,7 @@ class App:
         win.clear()
 
         self.window_height, self.window_width = self.get_dimensions(win)
-        self.text = word_wrap(self.text_backup, self.window_width)
+        self.wrap_text()
 
         self.screen_size_check()
 
@@ -452,6 +704,8 @@ class App:
         self.setup_print(win)
         self.update_state(win)
 
+        self.prefetch_neighbouring_texts()
+
     def print_stats(self, win):
         """Print the bottom stats bar after each run.
 
@@ -482,20 +736,19 @@ class App:
             win (any): Curses window.
         """
         current_wpm = 0
-        total_time = mitype.timer.get_elapsed_minutes_since_first_keypress(
+        total_time = timer.get_elapsed_minutes_since_first_keypress(
             self.start_time,
         )
         if total_time != 0:
-            words = self.current_string.split()
-            word_count = len(words)
-            current_wpm = word_count / total_time
+            current_wpm = self.state.word_count / total_time
 
-        win.addstr(
-            0,
-            self.window_width - 14,
-            f" {current_wpm:.2f} ",
-            self.Color.CYAN,
-        )
+        # Nothing to print if speed shown is unchanged
+        badge = f" {current_wpm:.2f} "
+        if badge == self.printed_wpm:
+            return
+        self.printed_wpm = badge
+
+        win.addstr(0, self.window_width - 14, badge, self.Color.CYAN)
         win.addstr(" WPM ")
 
     def replay(self, win):
@@ -519,19 +772,49 @@ class App:
 
         self.setup_print(win)
 
-        win.timeout(10)
-
-        next_tick = time.time()
-        for key in self.key_strokes:
-            next_tick += key[0]
-            wait_duration = max(0, next_tick - time.time())
-            time.sleep(wait_duration)
+        scheduler = ReplayScheduler(self.key_strokes, timer.now())
+        self.print_replay_speed(win, scheduler.speed)
 
+        while not scheduler.is_finished():
+            # Sleep until next frame is due unless a key is pressed
+            win.timeout(timer.milliseconds_until(scheduler.next_frame_deadline()))
             _key = self.keyinput(win)
+
             if is_escape(_key) or is_ctrl_c(_key):
                 sys.exit(0)
-            self.key_printer(win, key[1])
-        win.timeout(100)
+
+            if is_up_arrow_key(_key) or is_down_arrow_key(_key):
+                step = 1 if is_up_arrow_key(_key) else -1
+                scheduler.change_speed(step, timer.now())
+                self.print_replay_speed(win, scheduler.speed)
+
+            if is_left_arrow_key(_key) or is_right_arrow_key(_key):
+                step = 1 if is_right_arrow_key(_key) else -1
+                if scheduler.seek(step * REPLAY_SEEK_STEP, timer.now()):
+                    self.state.reset()
+                    self.token_index = 0
+
+            # Play every keystroke due in this frame and draw them at once
+            keys = scheduler.due_keys(timer.now())
+            for key in keys:
+                self.process_key(win, key)
+            if keys:
+                self.update_state(win)
+
+    def print_replay_speed(self, win, speed):
+        """Print replay speed and controls.
+
+        Args:
+            win (any): Curses window.
+            speed (float): Replay speed multiplier.
+        """
+        win.addstr(
+            self.number_of_lines_to_print_text + 2,
+            1,
+            f" {speed}x ",
+            self.Color.BLACK,
+        )
+        win.addstr(" Up/Down to change speed, Left/Right to seek. ")
 
     def share_result(self):
         """Open a twitter intent on a browser."""
@@ -545,16 +828,17 @@ class App:
         # URL encode message
         message = message.replace("\n", "%0D").replace("#", "%23")
         url = "https://twitter.com/intent/tweet?text=" + message
+
+        import webbrowser
+
         webbrowser.open(url, new=2)
 
     def reset_test(self):
         """Reset the data for current typing session."""
         self.mode = 0
-        self.current_word = ""
-        self.current_string = ""
+        self.state.reset()
         self.first_key_pressed = False
-        self.key_strokes = []
-        self.mistyped_keys = []
+        self.key_strokes = KeystrokeLog()
         self.start_time = 0
         self.token_index = 0
         self.current_speed_wpm = 0
@@ -577,20 +861,39 @@ class App:
         win.clear()
 
         self.text_id += value
-        self.text = load_from_database(self.text_id)[0]
-        self.tokens = self.text.split()
 
-        self.text = " ".join(self.tokens)
-        self.text_backup = self.text
+        # Use the text prepared in the background when available
+        prepared = self.prefetcher.get(self.text_id, self.window_width)
+        if prepared is None:
+            text = load_from_database(self.text_id)[0]
+            prepared = prepare_text(text, self.window_width)
 
-        self.text = word_wrap(self.text, self.window_width)
+        self.text_backup = prepared.text
+        self.layout = prepared.layout
+        self.text = self.layout.text
+        self.state = TypingState(self.text)
+        self.screen_size_check()
 
-        self.current_word_limit = len(max(self.tokens, key=len)) + 5
+        self.current_word_limit = self.layout.longest_token_length + 5
 
         self.reset_test()
         self.setup_print(win)
         self.update_state(win)
 
+        self.prefetch_neighbouring_texts()
+
+    def prefetch_neighbouring_texts(self):
+        """Prepare texts that arrow keys switch to in the background."""
+        if isinstance(self.text_id, int):
+            self.prefetcher.schedule(self.text_id, self.window_width)
+
+    def wrap_text(self):
+        """Word wrap text for current window width."""
+        self.layout = get_layout(self.text_backup, self.window_width)
+        self.text = self.layout.text
+        self.state.set_text(self.text)
+        self.current_word_limit = self.layout.longest_token_length + 5
+
     @staticmethod
     def get_dimensions(win):
         """Get the height and width of terminal.
@@ -604,11 +907,17 @@ class App:
         return win.getmaxyx()
 
     def screen_size_check(self):
-        """Check if screen size is enough to print text."""
-        self.number_of_lines_to_print_text = (
-            number_of_lines_to_fit_text_in_window(self.text, self.window_width) + 3
+        """Fit as many lines of text as possible on screen.
+
+        Text taller than the window is scrolled. Exits if not even a single
+        line fits along with the rest of the interface.
+        """
+        # Header, current word, results and stats take 11 lines
+        self.viewport_height = min(
+            len(self.layout.line_starts), self.window_height - 11
         )
-        if self.number_of_lines_to_print_text + 7 >= self.window_height:
+        self.number_of_lines_to_print_text = self.viewport_height + 3
+        if self.viewport_height < 1:
             curses.endwin()
             sys.stdout.write("Window too small to print given text")
             sys.exit(1)
@@ -619,37 +928,21 @@ class App:
         Args:
             key (key): Character to append.
         """
-        if len(self.current_word) < self.current_word_limit:
-            self.current_word += key
-            self.current_string += key
+        if self.state.word_length() < self.current_word_limit:
+            self.state.append(key)
 
     def erase_key(self):
         """Erase the last typed character."""
-        if len(self.current_word) > 0:
-            self.current_word = self.current_word[:-1]
-            self.current_string = self.current_string[:-1]
+        self.state.erase()
 
     def erase_word(self):
         """Erase the last typed word."""
-        if len(self.current_word) > 0:
-            index_word = self.current_word.rfind(" ")
-            if index_word == -1:
-                # Single word.
-                word_length = len(self.current_speed_wpm)
-                self.current_string = self.current_string[:-word_length]
-                self.current_word = ""
-            else:
-                diff = len(self.current_word) - index_word
-                self.current_word = self.current_word[:-diff]
-                self.current_string = self.current_string[:-diff]
+        self.state.erase_word()
 
     def check_word(self):
         """Accept finalized word."""
-        spc = get_space_count_after_ith_word(len(self.current_string), self.text)
-        if self.current_word == self.tokens[self.token_index]:
+        if self.state.current_word == self.layout.token(self.token_index):
+            self.state.accept_word(self.layout.space_count_after(self.token_index))
             self.token_index += 1
-            self.current_word = ""
-            self.current_string += spc * " "
         else:
-            self.current_word += " "
-            self.current_string += " "
+            self.state.append(" ")
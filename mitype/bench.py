@@ -0,0 +1,459 @@
+"""Benchmark the typing engine without a terminal.
+
+Keystroke streams are fed into `App.typing_mode` with curses replaced by a
+headless stand-in. Per keystroke latency, memory allocated and the amount
+of output written to the window are reported for each scenario, and can be
+stored as a baseline to catch performance regressions.
+
+Run with `python -m mitype.bench --help` for usage.
+"""
+
+import argparse
+import curses
+import json
+import random
+import sys
+import tracemalloc
+import types
+from unittest import mock
+
+import mitype.app
+import mitype.database
+from mitype import timer
+
+# Size of the headless window, long texts are scrolled
+BENCH_WINDOW_HEIGHT = 24
+BENCH_WINDOW_WIDTH = 80
+
+# Texts from data.db used by the short text scenarios
+SHORT_TEXT_IDS = (1, 1758, 3000, 4500, 5999)
+
+# Texts from data.db joined into a single long text, as loaded with --file
+LONG_TEXT_IDS = range(2000, 2060)
+
+# Metrics compared against a baseline, higher values being worse
+BASELINE_METRICS = ("p50_us", "p99_us", "bytes_per_key", "calls_per_key", "peak_kib")
+
+
+class HeadlessWindow:
+    """Curses window stand-in counting output instead of drawing it."""
+
+    def __init__(self, height, width):
+        """Initialize the window.
+
+        Args:
+            height (int): Number of lines.
+            width (int): Number of columns.
+        """
+        self.height = height
+        self.width = width
+
+        # Number of calls which output to the window and bytes written
+        self.calls = 0
+        self.bytes_written = 0
+
+    def getmaxyx(self):
+        """Get window dimensions.
+
+        Returns:
+            (int, int): Tuple of height and width.
+        """
+        return self.height, self.width
+
+    def addstr(self, *args):
+        """Count a string written to the window.
+
+        Args:
+            args: Optional line and column, string and optional attribute.
+        """
+        text = args[2] if isinstance(args[0], int) else args[0]
+        self.calls += 1
+        self.bytes_written += len(text.encode("utf-8"))
+
+    insstr = addstr
+
+    def move(self, line, column):
+        """Count a cursor movement.
+
+        Args:
+            line (int): Line to move to.
+            column (int): Column to move to.
+        """
+        self.calls += 1
+
+    def get_wch(self):
+        """Report that no key is pending.
+
+        Raises:
+            curses.error: Always, as no key is ever pressed.
+        """
+        raise curses.error("no input")
+
+    def clear(self):
+        """Do nothing, there is no screen to clear."""
+
+    def refresh(self):
+        """Do nothing, there is no screen to refresh."""
+
+    def nodelay(self, flag):
+        """Do nothing, input never blocks."""
+
+    def timeout(self, delay):
+        """Do nothing, input never blocks."""
+
+
+def headless_curses():
+    """Build a stand-in for the curses module which needs no terminal.
+
+    Returns:
+        types.SimpleNamespace: Curses constants with no-op functions.
+    """
+    module = types.SimpleNamespace(**vars(curses))
+    module.wrapper = lambda func: None
+    module.init_pair = lambda *args: None
+    module.color_pair = lambda pair_number: pair_number << 8
+    module.curs_set = lambda visibility: None
+    module.endwin = lambda: None
+    return module
+
+
+def create_app(text):
+    """Create an app ready to receive keystrokes for given text.
+
+    Args:
+        text (str): Sample text.
+
+    Returns:
+        (mitype.app.App, HeadlessWindow): Tuple of app and its window.
+    """
+    with mock.patch.object(
+        mitype.app, "resolve_commandline_arguments", lambda: (text, "bench")
+    ):
+        app = mitype.app.App()
+
+    win = HeadlessWindow(BENCH_WINDOW_HEIGHT, BENCH_WINDOW_WIDTH)
+    app.initialize(win)
+    return app, win
+
+
+def perfect_keys(text):
+    """Generate keys typing text without mistakes.
+
+    Args:
+        text (str): Sample text.
+
+    Returns:
+        list: Keys to press.
+    """
+    return list(" ".join(text.split()))
+
+
+def error_heavy_keys(text, error_rate=0.2, seed=0):
+    """Generate keys typing text with frequent mistakes which get corrected.
+
+    Mistyped characters are erased with backspace, and now and then a whole
+    mistyped word is erased with Ctrl+Backspace and typed again.
+
+    Args:
+        text (str): Sample text.
+        error_rate (float): Probability of a mistake before each character.
+        seed (int): Seed for the random generator.
+
+    Returns:
+        list: Keys to press.
+    """
+    generator = random.Random(seed)
+    keys = []
+    for word_index, word in enumerate(text.split()):
+        if word_index:
+            keys.append(" ")
+        if generator.random() < error_rate / 4:
+            keys.extend("xq")
+            keys.append("\x17")
+        for character in word:
+            if generator.random() < error_rate:
+                keys.append("#")
+                keys.append("KEY_BACKSPACE")
+            keys.append(character)
+    return keys
+
+
+def load_recorded_stream(path):
+    """Load a recorded keystroke stream.
+
+    Args:
+        path (str): Path to a JSON file with `text` and `keys` entries.
+
+    Returns:
+        (str, list): Tuple of sample text and keys to press.
+    """
+    with open(path, encoding="utf-8") as file:
+        recording = json.load(file)
+    return recording["text"], recording["keys"]
+
+
+def default_scenarios():
+    """Build the built-in scenarios.
+
+    Returns:
+        dict: Maps scenario name to a list of (text, keys) tuples.
+    """
+    short_texts = [mitype.database.fetch_text_from_id(i) for i in SHORT_TEXT_IDS]
+    long_text = "\n".join(mitype.database.fetch_text_from_id(i) for i in LONG_TEXT_IDS)
+
+    return {
+        "short": [(text, perfect_keys(text)) for text in short_texts],
+        "short-errors": [(text, error_heavy_keys(text)) for text in short_texts],
+        "long": [(long_text, perfect_keys(long_text))],
+        "long-errors": [(long_text, error_heavy_keys(long_text))],
+    }
+
+
+def run_stream(text, keys, trace_memory=False):
+    """Type keys into a fresh app.
+
+    Args:
+        text (str): Sample text.
+        keys (list): Keys to press.
+        trace_memory (bool): Whether to measure memory allocated while typing.
+
+    Returns:
+        (list, HeadlessWindow, int): Tuple of latency of each keystroke in
+        nanoseconds, window typed into and peak allocated memory in bytes.
+    """
+    app, win = create_app(text)
+    win.calls = win.bytes_written = 0
+    latencies = []
+    peak_memory = 0
+
+    if trace_memory:
+        tracemalloc.start()
+    try:
+        for key in keys:
+            start = timer.now()
+            app.typing_mode(win, key)
+            latencies.append(timer.now() - start)
+    finally:
+        if trace_memory:
+            peak_memory = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+
+    return latencies, win, peak_memory
+
+
+def percentile(sorted_values, fraction):
+    """Get a percentile of sorted values.
+
+    Args:
+        sorted_values (list): Values in ascending order.
+        fraction (float): Percentile as a fraction between 0 and 1.
+
+    Returns:
+        Union[int, float]: Value at the percentile.
+    """
+    index = min(len(sorted_values) - 1, int(fraction * len(sorted_values)))
+    return sorted_values[index]
+
+
+def run_scenario(streams, repeat=3, trace_memory=True):
+    """Measure a scenario.
+
+    Latencies of all repetitions are pooled. Memory is measured in a
+    separate run since tracing slows down every allocation.
+
+    Args:
+        streams (list): List of (text, keys) tuples.
+        repeat (int): Number of times every stream is typed.
+        trace_memory (bool): Whether to measure allocated memory.
+
+    Returns:
+        dict: Metrics of the scenario.
+    """
+    latencies = []
+    key_count = calls = bytes_written = peak_memory = 0
+
+    for text, keys in streams:
+        for _ in range(repeat):
+            stream_latencies, win, _ = run_stream(text, keys)
+            latencies.extend(stream_latencies)
+        key_count += len(keys)
+        calls += win.calls
+        bytes_written += win.bytes_written
+
+        if trace_memory:
+            peak_memory = max(peak_memory, run_stream(text, keys, True)[2])
+
+    latencies.sort()
+    microseconds = timer.NANOSECONDS_PER_SECOND // 1_000_000
+    return {
+        "keys": key_count,
+        "p50_us": percentile(latencies, 0.5) / microseconds,
+        "p90_us": percentile(latencies, 0.9) / microseconds,
+        "p99_us": percentile(latencies, 0.99) / microseconds,
+        "max_us": latencies[-1] / microseconds,
+        "bytes_per_key": bytes_written / key_count,
+        "calls_per_key": calls / key_count,
+        "peak_kib": peak_memory / 1024,
+    }
+
+
+def run_scenarios(scenarios, repeat=3, trace_memory=True):
+    """Measure scenarios with curses replaced by a headless stand-in.
+
+    Args:
+        scenarios (dict): Maps scenario name to a list of (text, keys) tuples.
+        repeat (int): Number of times every stream is typed.
+        trace_memory (bool): Whether to measure allocated memory.
+
+    Returns:
+        dict: Metrics by scenario name.
+    """
+    # Test results must not end up in the user's history
+    with mock.patch.object(mitype.app, "curses", headless_curses()), mock.patch.object(
+        mitype.app, "save_history", lambda *args: None
+    ):
+        return {
+            name: run_scenario(streams, repeat, trace_memory)
+            for name, streams in scenarios.items()
+        }
+
+
+def find_regressions(results, baseline, tolerance):
+    """Compare results with a baseline.
+
+    Args:
+        results (dict): Metrics by scenario name.
+        baseline (dict): Baseline metrics by scenario name.
+        tolerance (float): Allowed relative increase of a metric.
+
+    Returns:
+        list: Descriptions of the metrics which regressed.
+    """
+    regressions = []
+    for name, metrics in results.items():
+        for metric in BASELINE_METRICS:
+            if metric not in baseline.get(name, {}):
+                continue
+            limit = baseline[name][metric] * (1 + tolerance)
+            if metrics[metric] > limit:
+                regressions.append(
+                    f"{name}: {metric} {metrics[metric]:.2f} > {limit:.2f}"
+                )
+    return regressions
+
+
+def print_results(results):
+    """Print metrics as a table.
+
+    Args:
+        results (dict): Metrics by scenario name.
+    """
+    columns = ["keys", "p50_us", "p90_us", "p99_us", "max_us"]
+    columns += ["bytes_per_key", "calls_per_key", "peak_kib"]
+    print("scenario".ljust(14) + "".join(column.rjust(14) for column in columns))
+    for name, metrics in results.items():
+        values = "".join(f"{metrics[column]:14.2f}" for column in columns)
+        print(name.ljust(14) + values)
+
+
+def parse_arguments(args=None):
+    """Parse benchmark command line arguments.
+
+    Args:
+        args (list): Arguments to parse, defaults to `sys.argv`.
+
+    Returns:
+        argparse.Namespace: Parsed arguments.
+    """
+    parser = argparse.ArgumentParser(
+        prog="python -m mitype.bench",
+        description="Benchmark the mitype typing engine",
+    )
+    parser.add_argument(
+        "-s",
+        "--scenario",
+        action="append",
+        help="Scenario to run, all built-in scenarios when omitted",
+    )
+    parser.add_argument(
+        "-r",
+        "--record",
+        metavar="FILENAME",
+        action="append",
+        default=[],
+        help="JSON file with the text and keys of a recorded session",
+    )
+    parser.add_argument(
+        "-n",
+        "--repeat",
+        metavar="N",
+        default=3,
+        type=int,
+        help="Number of times each keystroke stream is typed",
+    )
+    parser.add_argument(
+        "--no-memory",
+        default=False,
+        action="store_true",
+        help="Skip measuring allocated memory",
+    )
+    parser.add_argument(
+        "--save-baseline",
+        metavar="FILENAME",
+        help="Store results as a baseline",
+    )
+    parser.add_argument(
+        "--baseline",
+        metavar="FILENAME",
+        help="Fail if results regressed compared to a stored baseline",
+    )
+    parser.add_argument(
+        "--tolerance",
+        default=0.25,
+        type=float,
+        help="Allowed relative increase compared to the baseline",
+    )
+    return parser.parse_args(args)
+
+
+def main(args=None):
+    """Run benchmarks.
+
+    Args:
+        args (list): Command line arguments, defaults to `sys.argv`.
+
+    Returns:
+        int: Exit status, 1 if a regression was found.
+    """
+    opt = parse_arguments(args)
+
+    scenarios = {}
+    if opt.scenario or not opt.record:
+        scenarios = default_scenarios()
+        if opt.scenario:
+            scenarios = {name: scenarios[name] for name in opt.scenario}
+    for path in opt.record:
+        scenarios[path] = [load_recorded_stream(path)]
+
+    results = run_scenarios(scenarios, opt.repeat, not opt.no_memory)
+
+    print_results(results)
+
+    if opt.save_baseline:
+        with open(opt.save_baseline, mode="w", encoding="utf-8") as file:
+            json.dump(results, file, indent=4)
+            file.write("\n")
+
+    if opt.baseline:
+        with open(opt.baseline, encoding="utf-8") as file:
+            regressions = find_regressions(results, json.load(file), opt.tolerance)
+        for regression in regressions:
+            print("Regression:", regression)
+        if regressions:
+            return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
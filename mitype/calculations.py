@@ -1,9 +1,15 @@
 """Calculations."""
 
 import math
+import re
 
 from mitype import timer
 
+# Approximate number of characters of text processed at once
+TEXT_CHUNK_SIZE = 1 << 16
+
+WHITESPACE_PATTERN = re.compile(r"\s")
+
 
 def first_index_at_which_strings_differ(string1, string2):
     """Return index at which there is a change in strings.
@@ -57,6 +63,61 @@ def get_space_count_after_ith_word(index, text):
     return count
 
 
+def text_chunks(text, size=TEXT_CHUNK_SIZE):
+    """Split text into chunks which do not cut words.
+
+    Each chunk but the last one ends right before a whitespace character.
+
+    Args:
+        text (str): Text to split.
+        size (int): Minimum length of a chunk.
+
+    Yields:
+        str: Consecutive parts of text.
+    """
+    start = 0
+    while start < len(text):
+        match = WHITESPACE_PATTERN.search(text, start + size)
+        end = match.start() if match else len(text)
+        yield text[start:end]
+        start = end
+
+
+def squash_whitespace(text):
+    """Replace runs of spaces, tabs and newlines with a single space.
+
+    Text is processed in chunks, so there is never a list of all its words
+    in memory.
+
+    Args:
+        text (str): Text to normalize.
+
+    Returns:
+        str: Words of text separated by single spaces.
+    """
+    return " ".join(
+        " ".join(words) for words in map(str.split, text_chunks(text)) if words
+    )
+
+
+def consecutive_runs(indices):
+    """Group indices into runs of consecutive values.
+
+    Args:
+        indices (list): Indices in ascending order, without duplicates.
+
+    Returns:
+        list: List of (start, end) tuples, end being one after the last index.
+    """
+    runs = []
+    for index in indices:
+        if runs and runs[-1][1] == index:
+            runs[-1] = (runs[-1][0], index + 1)
+        else:
+            runs.append((index, index + 1))
+    return runs
+
+
 def word_wrap(text, width):
     """Wrap text on the screen according to the window width.
 
@@ -69,46 +130,66 @@ def word_wrap(text, width):
     Returns:
         str: Return altered text.
     """
-    # For the end of each line, move backwards until you find a space.
-    # When you do, append those many spaces after the single space.
-    for line in range(
-        1,
-        number_of_lines_to_fit_text_in_window(text, width) + 1,
-    ):
-        # Current line fits in the window
-        if line * width >= len(text):
-            continue
+    return word_wrap_with_line_starts(text, width)[0]
+
 
-        # Last cell of that line
-        index = line * width - 1
+def word_wrap_with_line_starts(text, width):
+    """Wrap text according to the window width in a single pass.
 
-        # Continue if already a space
-        if text[index] == " ":
+    The space at which a line breaks is padded with extra spaces so that the
+    next word starts on a new line. Every line but the last one is then
+    exactly `width` characters long. Words longer than a line are split.
+
+    Args:
+        text (str): Text to wrap.
+        width (int): Width to wrap around.
+
+    Returns:
+        (str, range): Tuple of altered text and index at which each line starts.
+    """
+    lines = []
+    start = 0
+    while len(text) - start > width:
+        # Last cell of current line
+        end = start + width - 1
+
+        if text[end] == " ":
+            lines.append(text[start : end + 1])
+            start = end + 1
             continue
 
         # Find last occurrence of space on that line
-        index = text[:index].rfind(" ")
+        index = text.rfind(" ", start, end)
+        if index == -1:
+            # No space to break at, split the word
+            lines.append(text[start : end + 1])
+            start = end + 1
+            continue
 
-        space_count = line * width - index
-        space_string = " " * space_count
+        # Replace the space with enough spaces to fill the line
+        lines.append(text[start:index].ljust(width))
+        start = index + 1
+    if start < len(text):
+        lines.append(text[start:])
 
-        text = text[:index] + space_string + text[index + 1 :]
-    return text
+    text = "".join(lines)
+    # Every line but the last one is exactly `width` characters long
+    return text, range(0, len(text), width)
 
 
-def speed_in_wpm(text, start_time):
+def speed_in_wpm(word_count, start_time):
     """Calculate typing speed in WPM.
 
     Args:
-        text (list): List of words from sample text.
-        start_time (float): The time when user starts typing
+        word_count (int): Number of words in sample text.
+        start_time (int): The time in nanoseconds when user starts typing
             the sample text.
 
     Returns:
         str: Speed in WPM up to 2 decimal places.
     """
     time_taken = timer.get_elapsed_minutes_since_first_keypress(start_time)
-    wpm = len(text) / time_taken
+    wpm = word_count / time_taken
 
     return f"{wpm:.2f}"
 
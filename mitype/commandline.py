@@ -2,6 +2,12 @@
 Start of app.
 
 Parses command line arguments and decides and fills text accordingly.
+
+Modules which only some options or actions need, such as sqlite3 or
+webbrowser, are imported where they are used so that options which only
+print information start fast. Launching without a text option selects a
+text by difficulty, which needs sqlite3 and the cache database on every
+start and builds the text metadata on the first one.
 """
 
 import argparse
@@ -10,8 +16,11 @@ import random
 import sys
 
 import mitype
-import mitype.database
-from mitype.history import show_history
+from mitype.history import (
+    history_database_absolute_path,
+    migrate_history,
+    show_history,
+)
 
 
 def resolve_commandline_arguments():
@@ -21,15 +30,9 @@ def resolve_commandline_arguments():
         (str, Union[str, int]): Tuple of text content and text ID.
     """
     opt = parse_arguments()
-    if opt.version:
-        display_version()
-        sys.exit(0)
+    handle_informational_arguments(opt)
 
-    elif opt.history is not None:
-        show_history(opt.history)
-        sys.exit(0)
-
-    elif opt.file:
+    if opt.file:
         text, text_id = load_text_from_file(opt.file)
 
     elif opt.id:
@@ -44,6 +47,32 @@ def resolve_commandline_arguments():
     return text, text_id
 
 
+def handle_informational_arguments(opt):
+    """Handle options which print information and exit.
+
+    Args:
+        opt (argparse.Namespace): Parsed command line arguments.
+    """
+    if opt.version:
+        display_version()
+        sys.exit(0)
+
+    elif opt.history is not None:
+        show_history(opt.history)
+        sys.exit(0)
+
+    elif opt.search is not None:
+        show_search_results(opt.search)
+        sys.exit(0)
+
+    elif opt.migrate_history:
+        record_count = migrate_history()
+        print(
+            f"Imported {record_count} records into {history_database_absolute_path()}"
+        )
+        sys.exit(0)
+
+
 def parse_arguments():
     """Parse command line arguments.
 
@@ -99,9 +128,44 @@ def parse_arguments():
         help="Show mitype score history",
     )
 
+    parser.add_argument(
+        "--migrate-history",
+        default=False,
+        action="store_true",
+        help="Move score history to an indexed database",
+    )
+
+    parser.add_argument(
+        "--search",
+        metavar="PHRASE",
+        default=None,
+        type=str,
+        help="Find IDs of database texts containing a phrase",
+    )
+
     return parser.parse_args()
 
 
+def show_search_results(phrase):
+    """Print IDs of database texts matching a phrase, best matches first.
+
+    Args:
+        phrase (str): Words to search for.
+    """
+    import mitype.database
+    import mitype.search
+
+    text_ids = mitype.search.search_texts(phrase)
+    if not text_ids:
+        print(f"No text found for: {phrase}")
+        return
+
+    for text_id in text_ids:
+        text = " ".join(mitype.database.fetch_text_from_id(text_id).split())
+        preview = text if len(text) <= 60 else text[:57] + "..."
+        print(f"{text_id:>5}  {preview}")
+
+
 def display_version():
     """Display version."""
     print(f"Mitype version {mitype.__version__}")
@@ -135,12 +199,14 @@ def load_from_database(text_id):
     Returns:
         (str, int): Tuple of text content followed by DB row identifier.
     """
-    row_count = 6000
-    if 1 <= text_id <= row_count:
+    import mitype.database
+
+    text_count = mitype.database.get_text_count()
+    if 1 <= text_id <= text_count:
         text = mitype.database.fetch_text_from_id(text_id)
         return text, text_id
 
-    print("ID must be in range [1,6000]")
+    print(f"ID must be in range [1,{text_count}]")
     sys.exit(1)
 
 
@@ -156,14 +222,12 @@ def load_based_on_difficulty(difficulty_level=random.randrange(1, 6)):
     Returns:
         (str, int): Tuple of text content followed by DB row identifier.
     """
-    max_level = 5
-
-    if 1 <= difficulty_level <= max_level:
-        # Each difficulty section has 6000/5 = 1200 texts each
-        upper_limit = difficulty_level * 1200
-        lower_limit = upper_limit - 1200 + 1
+    import mitype.database
+    import mitype.metadata
 
-        text_id = random.randrange(lower_limit, upper_limit + 1)
+    if 1 <= difficulty_level <= mitype.metadata.DIFFICULTY_LEVELS:
+        # Texts are ranked by difficulty into levels of equal size
+        text_id = mitype.metadata.random_text_id(difficulty_level)
         text = mitype.database.fetch_text_from_id(text_id)
 
         return text, text_id
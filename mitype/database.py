@@ -1,7 +1,41 @@
-"""Deals with fetching texts from database."""
+"""Deals with fetching texts from database.
 
+Texts are read from a memory mapped corpus file when one was built next to
+data.db, and from data.db otherwise.
+"""
+
+import functools
+import mmap
 import os
-import sqlite3
+import pathlib
+import struct
+import threading
+
+# For details related to the database schema check CONTRIBUTING.md
+FETCH_TEXT_QUERY = "SELECT txt FROM data WHERE id=?"
+FETCH_ALL_TEXTS_QUERY = "SELECT id, txt FROM data ORDER BY id"
+TEXT_COUNT_QUERY = "SELECT MAX(id) FROM data"
+
+# Corpus file layout: a header, an index entry per text ID and then the
+# whitespace normalized UTF-8 texts one after another
+CORPUS_FILENAME = "data.corpus"
+CORPUS_MAGIC = b"MITYPEC1"
+# Magic bytes and number of index entries
+CORPUS_HEADER = struct.Struct("<8sI")
+# Offset of text in file and its length in bytes
+CORPUS_INDEX_ENTRY = struct.Struct("<II")
+
+# Number of recently fetched texts kept in memory
+TEXT_CACHE_SIZE = 64
+
+_connection = None
+# Texts are also fetched from a background thread
+_connection_lock = threading.Lock()
+
+# Memory map of corpus file, `None` if there is no usable corpus file
+_corpus = None
+_corpus_opened = False
+_corpus_lock = threading.Lock()
 
 
 def database_file_absolute_path():
@@ -21,8 +55,120 @@ def database_file_absolute_path():
     )
 
 
+def corpus_file_absolute_path():
+    """Get full path of the corpus file built from data.db.
+
+    Returns:
+        str: The path of corpus file.
+    """
+    return os.path.join(
+        os.path.dirname(database_file_absolute_path()),
+        CORPUS_FILENAME,
+    )
+
+
+def get_connection():
+    """Get the connection to data.db shared by the whole process.
+
+    The database is opened once, read-only and as immutable, which lets
+    SQLite skip locking and change detection. Statements executed on the
+    connection are prepared once and reused from its statement cache.
+
+    The connection may be used from any thread while holding
+    `_connection_lock`.
+
+    Returns:
+        sqlite3.Connection: Connection to data.db.
+    """
+    global _connection
+
+    if _connection is None:
+        # Not needed when texts are read from the corpus file
+        import sqlite3
+
+        database_uri = pathlib.Path(database_file_absolute_path()).as_uri()
+        _connection = sqlite3.connect(
+            f"{database_uri}?mode=ro&immutable=1",
+            uri=True,
+            check_same_thread=False,
+        )
+    return _connection
+
+
+def open_corpus(corpus_path):
+    """Memory map a corpus file.
+
+    Args:
+        corpus_path (str): Path of corpus file.
+
+    Returns:
+        Union[mmap.mmap, None]: Memory map of file or `None` if it does not
+        exist or is not a corpus file.
+    """
+    try:
+        with open(corpus_path, "rb") as corpus_file:
+            corpus = mmap.mmap(corpus_file.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        # Missing or empty file
+        return None
+
+    if (
+        len(corpus) < CORPUS_HEADER.size
+        or CORPUS_HEADER.unpack_from(corpus)[0] != CORPUS_MAGIC
+    ):
+        corpus.close()
+        return None
+    return corpus
+
+
+def get_corpus():
+    """Get the memory mapped corpus shared by the whole process.
+
+    Returns:
+        Union[mmap.mmap, None]: Memory map of corpus file or `None` if there
+        is no corpus file.
+    """
+    global _corpus, _corpus_opened
+
+    with _corpus_lock:
+        if not _corpus_opened:
+            _corpus = open_corpus(corpus_file_absolute_path())
+            _corpus_opened = True
+    return _corpus
+
+
+def read_corpus_text(corpus, serial_id):
+    """Read a text from a memory mapped corpus.
+
+    The text is decoded straight from the mapped pages.
+
+    Args:
+        corpus (mmap.mmap): Memory map of corpus file.
+        serial_id (int): The unique ID of database entry.
+
+    Returns:
+        Union[str, None]: The text or `None` if the corpus does not have it.
+    """
+    _, count = CORPUS_HEADER.unpack_from(corpus)
+    if not 1 <= serial_id <= count:
+        return None
+
+    offset, length = CORPUS_INDEX_ENTRY.unpack_from(
+        corpus,
+        CORPUS_HEADER.size + (serial_id - 1) * CORPUS_INDEX_ENTRY.size,
+    )
+    if length == 0:
+        return None
+    with memoryview(corpus) as view:
+        return str(view[offset : offset + length], "utf-8")
+
+
+@functools.lru_cache(maxsize=TEXT_CACHE_SIZE)
 def fetch_text_from_id(serial_id):
-    """Fetch row from data.db database.
+    """Fetch text from the corpus file or from data.db database.
+
+    Texts read from the corpus have their whitespace already normalized.
+    Recently fetched texts are cached.
 
     Args:
         serial_id (int): The unique ID of database entry.
@@ -30,13 +176,88 @@ def fetch_text_from_id(serial_id):
     Returns:
         str: The text corresponding to the entry_id.
     """
-    database_file = database_file_absolute_path()
-    connection = sqlite3.connect(database_file)
-    cursor = connection.cursor()
+    corpus = get_corpus()
+    if corpus is not None:
+        text = read_corpus_text(corpus, serial_id)
+        if text is not None:
+            return text
+
+    with _connection_lock:
+        cursor = get_connection().execute(FETCH_TEXT_QUERY, (serial_id,))
+        return cursor.fetchone()[0]
+
+
+@functools.lru_cache(maxsize=None)
+def get_text_count():
+    """Get number of texts, which are numbered from 1.
+
+    Returns:
+        int: Highest text ID.
+    """
+    corpus = get_corpus()
+    if corpus is not None:
+        return CORPUS_HEADER.unpack_from(corpus)[1]
+
+    with _connection_lock:
+        return get_connection().execute(TEXT_COUNT_QUERY).fetchone()[0]
+
+
+def fetch_all_texts():
+    """Fetch every row from data.db database.
+
+    Returns:
+        list: List of (ID, text) tuples in ID order.
+    """
+    with _connection_lock:
+        return get_connection().execute(FETCH_ALL_TEXTS_QUERY).fetchall()
+
+
+def build_corpus(corpus_path=None, database_path=None):
+    """Export texts of data.db into a corpus file.
+
+    Every text is stored whitespace normalized and UTF-8 encoded, preceded
+    by a fixed width index giving the offset and length of each text by ID.
+    The file is written under a temporary name and moved in place.
+
+    Args:
+        corpus_path (str): Path of corpus file, next to data.db by default.
+        database_path (str): Path of database, data.db by default.
+
+    Returns:
+        int: Number of texts exported.
+    """
+    import sqlite3
+
+    from mitype.calculations import squash_whitespace
+
+    corpus_path = corpus_path or corpus_file_absolute_path()
+    database_path = os.path.abspath(database_path or database_file_absolute_path())
+    database_uri = pathlib.Path(database_path).as_uri()
+
+    connection = sqlite3.connect(f"{database_uri}?mode=ro", uri=True)
+    try:
+        texts = {
+            serial_id: squash_whitespace(text).encode("utf-8")
+            for serial_id, text in connection.execute(FETCH_ALL_TEXTS_QUERY)
+        }
+    finally:
+        connection.close()
+
+    count = max(texts, default=0)
+    offset = CORPUS_HEADER.size + count * CORPUS_INDEX_ENTRY.size
+    index = bytearray()
+    for serial_id in range(1, count + 1):
+        # IDs missing from the database get an empty entry
+        text = texts.get(serial_id, b"")
+        index += CORPUS_INDEX_ENTRY.pack(offset if text else 0, len(text))
+        offset += len(text)
 
-    # For details related to the database schema check CONTRIBUTING.md
-    cursor.execute("SELECT txt FROM data where id=?", (serial_id,))
-    text = cursor.fetchone()[0]
-    connection.close()
+    temporary_path = corpus_path + ".tmp"
+    with open(temporary_path, "wb") as corpus_file:
+        corpus_file.write(CORPUS_HEADER.pack(CORPUS_MAGIC, count))
+        corpus_file.write(index)
+        for serial_id in range(1, count + 1):
+            corpus_file.write(texts.get(serial_id, b""))
+    os.replace(temporary_path, corpus_path)
 
-    return text
+    return len(texts)
@@ -5,6 +5,29 @@ import os
 import time
 from datetime import date
 
+HISTORY_HEADER = ["ID", "WPM", "DATE", "TIME", "ACCURACY"]
+
+# Size of blocks in which history file is read from its end
+HISTORY_BLOCK_SIZE = 4096
+
+# Records are indexed by date and text ID for stats queries
+HISTORY_SCHEMA = """
+CREATE TABLE IF NOT EXISTS history (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    text_id TEXT,
+    wpm TEXT,
+    date TEXT,
+    time TEXT,
+    accuracy TEXT
+);
+CREATE INDEX IF NOT EXISTS history_date ON history(date);
+CREATE INDEX IF NOT EXISTS history_text_id ON history(text_id);
+"""
+
+INSERT_RECORD_QUERY = (
+    "INSERT INTO history (text_id, wpm, date, time, accuracy) VALUES (?, ?, ?, ?, ?)"
+)
+
 
 def history_file_absolute_path():
     """Get full path of history file.
@@ -19,6 +42,64 @@ def history_file_absolute_path():
     return os.path.join(os.path.expanduser("~"), history_filename)
 
 
+def history_database_absolute_path():
+    """Get full path of history database.
+
+    History is stored in this database instead of the history file once
+    it has been migrated with `migrate_history`.
+
+    Returns:
+        str: The path of history database.
+    """
+    history_database_filename = ".mitype_history.db"
+
+    return os.path.join(os.path.expanduser("~"), history_database_filename)
+
+
+def uses_history_database():
+    """Check if history has been migrated to the database.
+
+    Returns:
+        bool: `True` if history database exists.
+    """
+    return os.path.isfile(history_database_absolute_path())
+
+
+def connect_history_database():
+    """Open history database, creating its table and indexes if needed.
+
+    Returns:
+        sqlite3.Connection: Connection to history database.
+    """
+    import sqlite3
+
+    connection = sqlite3.connect(history_database_absolute_path())
+    connection.executescript(HISTORY_SCHEMA)
+    return connection
+
+
+def migrate_history():
+    """Import records of the history file into the history database.
+
+    The history file is left untouched. Records are only imported into an
+    empty database so that running the migration again is harmless.
+
+    Returns:
+        int: Number of imported records.
+    """
+    connection = connect_history_database()
+    try:
+        if connection.execute("SELECT 1 FROM history LIMIT 1").fetchone():
+            return 0
+
+        records = get_history_file_records(-1)
+        with connection:
+            connection.executemany(INSERT_RECORD_QUERY, records)
+        return len(records)
+    finally:
+        connection.close()
+
+
 def get_history_records(number_of_records):
     """Get records from history.
 
@@ -29,11 +110,54 @@ def get_history_records(number_of_records):
     Returns:
         list: A list of records. The len of this list is `number_of_records` or all records
     """
+    if uses_history_database():
+        return get_history_database_records(number_of_records)
+    return get_history_file_records(number_of_records)
+
+
+def get_history_database_records(number_of_records):
+    """Get records from history database.
+
+    Args:
+        number_of_records (int): Number of last records to get, -1 for all.
+    Returns:
+        list: A list of records, oldest first.
+    """
+    connection = connect_history_database()
+    try:
+        # SQLite treats a negative limit as no limit
+        rows = connection.execute(
+            "SELECT text_id, wpm, date, time, accuracy FROM history "
+            "ORDER BY id DESC LIMIT ?",
+            (number_of_records,),
+        ).fetchall()
+    finally:
+        connection.close()
+
+    return [[str(value) for value in row] for row in reversed(rows)]
+
+
+def get_history_file_records(number_of_records):
+    """Get records from history file.
+
+    The last records are read from the end of the file so that only those
+    are parsed. The whole file is only read when all records are requested.
+
+    Args:
+        number_of_records (int): Number of last records to get, -1 for all.
+    Returns:
+        list: A list of records, oldest first.
+    """
     history_file_path = history_file_absolute_path()
 
     if not os.path.exists(history_file_path):
         return []
 
+    if number_of_records >= 0:
+        with open(history_file_path, mode="rb") as file:
+            lines = read_last_lines(file, number_of_records)
+        return list(csv.reader(line.decode("utf-8") for line in lines))
+
     with open(history_file_path, encoding="utf-8") as file:
         history_reader = csv.reader(file)
 
@@ -44,16 +168,44 @@ def get_history_records(number_of_records):
             # No header found on the file, meaning the file is empty
             return []
 
-        data = list(history_reader)
-        total_records = len(data)
+        return list(history_reader)
+
+
+def read_last_lines(file, number_of_lines):
+    """Read the last lines of a history file, excluding its header.
 
-        if number_of_records <= -1 or number_of_records >= total_records:
-            number_of_records = total_records
+    The file is read backwards in blocks until enough lines are found.
 
-        start_count = 0
-        if number_of_records < total_records and number_of_records != -1:
-            start_count = total_records - number_of_records
-        return data[start_count:total_records]
+    Args:
+        file (io.BufferedReader): History file opened in binary mode.
+        number_of_lines (int): Number of lines to read.
+
+    Returns:
+        list: Last lines as bytes, oldest first.
+    """
+    if number_of_lines == 0:
+        return []
+
+    position = file.seek(0, os.SEEK_END)
+    blocks = []
+    newline_count = 0
+
+    # A complete line is preceded by a newline and the file ends with one
+    while position > 0 and newline_count <= number_of_lines:
+        block_size = min(HISTORY_BLOCK_SIZE, position)
+        position -= block_size
+        file.seek(position)
+        block = file.read(block_size)
+        blocks.append(block)
+        newline_count += block.count(b"\n")
+
+    lines = [line for line in b"".join(reversed(blocks)).splitlines() if line]
+
+    if position == 0:
+        # Skip csv header
+        lines = lines[1:]
+
+    return lines[-number_of_lines:]
 
 
 def show_history(number_of_records):
@@ -84,6 +236,27 @@ def save_history(text_id, current_speed_wpm, accuracy):
         current_speed_wpm (float): Speed result from test.
         accuracy (str): Accuracy result from test.
     """
+    current_time = time.strftime("%H:%M:%S", time.localtime())
+
+    test_data = [
+        text_id,
+        current_speed_wpm,
+        date.today(),
+        current_time,
+        accuracy,
+    ]
+
+    if uses_history_database():
+        connection = connect_history_database()
+        try:
+            with connection:
+                connection.execute(
+                    INSERT_RECORD_QUERY, [str(value) for value in test_data]
+                )
+        finally:
+            connection.close()
+        return
+
     history_path = history_file_absolute_path()
 
     file_exists = os.path.isfile(history_path)
@@ -92,16 +265,6 @@ def save_history(text_id, current_speed_wpm, accuracy):
         csv_history = csv.writer(history)
 
         if not file_exists:
-            row = ["ID", "WPM", "DATE", "TIME", "ACCURACY"]
-            csv_history.writerow(row)
-
-        current_time = time.strftime("%H:%M:%S", time.localtime())
-
-        test_data = [
-            text_id,
-            current_speed_wpm,
-            date.today(),
-            current_time,
-            accuracy,
-        ]
+            csv_history.writerow(HISTORY_HEADER)
+
         csv_history.writerow(test_data)
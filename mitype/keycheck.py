@@ -211,3 +211,31 @@ def is_left_arrow_key(key):
     if key == "KEY_LEFT":
         return True
     return key == curses.KEY_LEFT
+
+
+def is_up_arrow_key(key):
+    """Detect up arrow key.
+
+    Args:
+        key (str): Character to check.
+
+    Returns:
+        bool: `True` if key is up arrow key or `False` otherwise.
+    """
+    if key == "KEY_UP":
+        return True
+    return key == curses.KEY_UP
+
+
+def is_down_arrow_key(key):
+    """Detect down arrow key.
+
+    Args:
+        key (str): Character to check.
+
+    Returns:
+        bool: `True` if key is down arrow key or `False` otherwise.
+    """
+    if key == "KEY_DOWN":
+        return True
+    return key == curses.KEY_DOWN
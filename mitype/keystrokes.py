@@ -0,0 +1,80 @@
+"""Compact record of the keys pressed during a typing session."""
+
+from array import array
+
+
+class KeystrokeLog:
+    """Keys pressed during a session along with the time they were pressed.
+
+    Timestamps are stored in an array of 64 bit integers. Keys are stored in
+    an array of integer codes: a character is stored as its code point while
+    any other key (special key names, curses key codes) is stored once in a
+    small table and referred to by a negative code.
+    """
+
+    def __init__(self):
+        """Initialize an empty log."""
+        self.timestamps = array("q")
+        self.key_codes = array("i")
+
+        self.special_keys = []
+        self.special_key_codes = {}
+
+    def __len__(self):
+        """Get number of recorded keystrokes.
+
+        Returns:
+            int: Number of keystrokes.
+        """
+        return len(self.timestamps)
+
+    def __iter__(self):
+        """Iterate over recorded keystrokes.
+
+        Yields:
+            (int, Union[str, int]): Tuple of time in nanoseconds and key.
+        """
+        for timestamp, key_code in zip(self.timestamps, self.key_codes):
+            yield timestamp, self.decode_key(key_code)
+
+    def append(self, timestamp, key):
+        """Record a keystroke.
+
+        Args:
+            timestamp (int): Time in nanoseconds at which key was pressed.
+            key (Union[str, int]): Pressed key.
+        """
+        self.timestamps.append(timestamp)
+        self.key_codes.append(self.encode_key(key))
+
+    def encode_key(self, key):
+        """Get integer code of a key.
+
+        Args:
+            key (Union[str, int]): Key to encode.
+
+        Returns:
+            int: Code of the key.
+        """
+        if isinstance(key, str) and len(key) == 1:
+            return ord(key)
+
+        code = self.special_key_codes.get(key)
+        if code is None:
+            self.special_keys.append(key)
+            code = -len(self.special_keys)
+            self.special_key_codes[key] = code
+        return code
+
+    def decode_key(self, key_code):
+        """Get key from its integer code.
+
+        Args:
+            key_code (int): Code returned by `encode_key`.
+
+        Returns:
+            Union[str, int]: Decoded key.
+        """
+        if key_code >= 0:
+            return chr(key_code)
+        return self.special_keys[-key_code - 1]
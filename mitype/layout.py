@@ -0,0 +1,197 @@
+"""Word wrapped layout of a text and offsets of its words."""
+
+import collections
+import re
+import threading
+from array import array
+
+from mitype.calculations import TEXT_CHUNK_SIZE, text_chunks, word_wrap_with_line_starts
+
+# Run of characters making up a word
+WORD_PATTERN = re.compile(r"\S+")
+
+# Total characters of text and wrapped text kept by the layout cache
+# Texts too long to fit are wrapped again every time
+LAYOUT_CACHE_CHARACTERS = 1 << 22
+
+# Maps (text, width) to its layout, least recently used first
+_layouts = collections.OrderedDict()
+_layouts_characters = 0
+# Layouts are also built from a background thread
+_layouts_lock = threading.Lock()
+
+
+class TextLayout:
+    """Text wrapped for a window width, indexed by word and line.
+
+    Offsets of words are computed once, so finding the spaces after a word
+    or the line it is printed on does not scan the text again. Words are
+    indexed a chunk at a time as they are asked for, which keeps loading a
+    long text fast.
+    """
+
+    def __init__(self, text, width):
+        """Wrap and index text.
+
+        Args:
+            text (str): Text with words separated by single spaces.
+            width (int): Width to wrap around.
+        """
+        self.width = width
+        self.text, self.line_starts = word_wrap_with_line_starts(text, width)
+
+        # Index of first character of each word and one after its last one
+        # Words split across lines stay a single word
+        self._token_starts = array("i")
+        self._token_ends = array("i")
+        # Index in wrapped text up to which words are indexed
+        self._indexed_length = 0
+
+        # Words are separated by single spaces before wrapping
+        self._token_count = text.count(" ") + 1 if text else 0
+        self.longest_token_length = longest_word_length(text)
+
+    def _index_tokens(self, token_index):
+        """Index words of text up to given word.
+
+        Args:
+            token_index (int): Index of word.
+        """
+        while len(self._token_starts) <= token_index and self._indexed_length < len(
+            self.text
+        ):
+            # Stop at a space so that no word is cut
+            end = self.text.find(" ", self._indexed_length + TEXT_CHUNK_SIZE)
+            if end == -1:
+                end = len(self.text)
+            for match in WORD_PATTERN.finditer(self.text, self._indexed_length, end):
+                self._token_starts.append(match.start())
+                self._token_ends.append(match.end())
+            self._indexed_length = end
+
+    def token_span(self, token_index):
+        """Get offsets of a word in wrapped text.
+
+        Args:
+            token_index (int): Index of word.
+
+        Returns:
+            (int, int): Tuple of index of first character of word and index
+            after its last one.
+        """
+        self._index_tokens(token_index)
+        return self._token_starts[token_index], self._token_ends[token_index]
+
+    def token(self, token_index):
+        """Get a word of text.
+
+        Args:
+            token_index (int): Index of word.
+
+        Returns:
+            str: Word.
+        """
+        start, end = self.token_span(token_index)
+        return self.text[start:end]
+
+    def token_count(self):
+        """Get number of words in text.
+
+        Returns:
+            int: Number of words.
+        """
+        return self._token_count
+
+    def space_count_after(self, token_index):
+        """Get number of spaces between a word and the next one.
+
+        Includes the spaces padding the line when the word ends a line.
+
+        Args:
+            token_index (int): Index of word.
+
+        Returns:
+            int: Number of spaces after the word.
+        """
+        end = self.token_span(token_index)[1]
+        if token_index + 1 < self._token_count:
+            return self.token_span(token_index + 1)[0] - end
+        return len(self.text) - end
+
+    def line_of(self, index):
+        """Get line on which a character of text is printed.
+
+        Args:
+            index (int): Index of character in text.
+
+        Returns:
+            int: Line number, starting at 0.
+        """
+        return index // self.width
+
+
+def longest_word_length(text):
+    """Get length of longest word.
+
+    Args:
+        text (str): Text with words separated by single spaces.
+
+    Returns:
+        int: Number of characters in longest word.
+    """
+    return max(
+        (max(map(len, chunk.split()), default=0) for chunk in text_chunks(text)),
+        default=0,
+    )
+
+
+def layout_characters(layout, text):
+    """Get number of characters a cached layout keeps in memory.
+
+    Args:
+        layout (TextLayout): Layout of text.
+        text (str): Text the layout was built from.
+
+    Returns:
+        int: Length of text and of wrapped text.
+    """
+    return len(text) + len(layout.text)
+
+
+def get_layout(text, width):
+    """Get layout of text for given width, wrapping it only once.
+
+    Resizing the window back to a previous width or returning to a text
+    reuses the layout built before. Least recently used layouts are dropped
+    once cached layouts hold more than `LAYOUT_CACHE_CHARACTERS` characters.
+    Layouts are shared and must not be modified.
+
+    Args:
+        text (str): Text with words separated by single spaces.
+        width (int): Width to wrap around.
+
+    Returns:
+        TextLayout: Layout of text.
+    """
+    global _layouts_characters
+
+    key = (text, width)
+    with _layouts_lock:
+        layout = _layouts.get(key)
+        if layout is not None:
+            _layouts.move_to_end(key)
+            return layout
+
+    layout = TextLayout(text, width)
+    characters = layout_characters(layout, text)
+    if characters > LAYOUT_CACHE_CHARACTERS:
+        return layout
+
+    with _layouts_lock:
+        if key not in _layouts:
+            _layouts[key] = layout
+            _layouts_characters += characters
+        while _layouts_characters > LAYOUT_CACHE_CHARACTERS:
+            (old_text, _), old_layout = _layouts.popitem(last=False)
+            _layouts_characters -= layout_characters(old_layout, old_text)
+    return layout
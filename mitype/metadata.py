@@ -0,0 +1,192 @@
+"""Precomputed statistics of database texts.
+
+Statistics of every text of data.db are computed once and stored in a
+cache database in the user's home directory, so that texts can be selected
+with an indexed query instead of fetching them.
+"""
+
+import os
+import random
+import string
+
+import mitype.database
+
+# Number of difficulty levels, each holding as many texts
+DIFFICULTY_LEVELS = 5
+
+METADATA_SCHEMA = """
+CREATE TABLE IF NOT EXISTS text_metadata (
+    text_id INTEGER PRIMARY KEY,
+    char_count INTEGER,
+    word_count INTEGER,
+    longest_word INTEGER,
+    punctuation_ratio REAL,
+    digit_ratio REAL,
+    difficulty INTEGER
+);
+CREATE INDEX IF NOT EXISTS text_metadata_difficulty
+    ON text_metadata(difficulty, text_id);
+CREATE TABLE IF NOT EXISTS metadata_source (
+    name TEXT PRIMARY KEY,
+    signature TEXT
+);
+"""
+
+INSERT_METADATA_QUERY = (
+    "INSERT INTO text_metadata (text_id, char_count, word_count, longest_word, "
+    "punctuation_ratio, digit_ratio, difficulty) VALUES (?, ?, ?, ?, ?, ?, ?)"
+)
+
+PUNCTUATION = frozenset(string.punctuation)
+
+
+def cache_database_absolute_path():
+    """Get full path of cache database.
+
+    Returns:
+        str: The path of cache database.
+    """
+    cache_database_filename = ".mitype_cache.db"
+
+    return os.path.join(os.path.expanduser("~"), cache_database_filename)
+
+
+def connect_cache_database():
+    """Open cache database, creating its tables and indexes if needed.
+
+    An in-memory database is used when the cache file cannot be written.
+
+    Returns:
+        sqlite3.Connection: Connection to cache database.
+    """
+    import sqlite3
+
+    try:
+        connection = sqlite3.connect(cache_database_absolute_path())
+        connection.executescript(METADATA_SCHEMA)
+    except sqlite3.Error:
+        connection = sqlite3.connect(":memory:")
+        connection.executescript(METADATA_SCHEMA)
+    return connection
+
+
+def database_signature():
+    """Identify the current version of data.db.
+
+    Returns:
+        str: Size and modification time of data.db.
+    """
+    stat = os.stat(mitype.database.database_file_absolute_path())
+    return f"{stat.st_size}:{stat.st_mtime_ns}"
+
+
+def text_statistics(text):
+    """Compute statistics of a text.
+
+    Args:
+        text (str): Text with words separated by single spaces.
+
+    Returns:
+        (int, int, int, float, float): Tuple of number of characters, number
+        of words, length of longest word, and ratios of punctuation and
+        digit characters.
+    """
+    char_count = len(text)
+    words = text.split()
+    punctuation_count = sum(char in PUNCTUATION for char in text)
+    digit_count = sum(char.isdigit() for char in text)
+    return (
+        char_count,
+        len(words),
+        max(map(len, words), default=0),
+        punctuation_count / max(char_count, 1),
+        digit_count / max(char_count, 1),
+    )
+
+
+def difficulty_score(statistics):
+    """Score how hard a text is to type.
+
+    Longer texts are harder, and punctuation and digits make them harder.
+
+    Args:
+        statistics (tuple): Statistics from `text_statistics`.
+
+    Returns:
+        float: Score, higher being harder.
+    """
+    char_count, _, _, punctuation_ratio, digit_ratio = statistics
+    return char_count * (1 + punctuation_ratio + digit_ratio)
+
+
+def build_metadata(connection):
+    """Compute statistics of every text of data.db into cache database.
+
+    Texts are ranked by difficulty score and split into as many levels of
+    equal size.
+
+    Args:
+        connection (sqlite3.Connection): Connection to cache database.
+
+    Returns:
+        int: Number of texts.
+    """
+    rows = [
+        (text_id, text_statistics(" ".join(text.split())))
+        for text_id, text in mitype.database.fetch_all_texts()
+    ]
+    rows.sort(key=lambda row: (difficulty_score(row[1]), row[0]))
+
+    with connection:
+        connection.execute("DELETE FROM text_metadata")
+        connection.executemany(
+            INSERT_METADATA_QUERY,
+            (
+                (text_id, *statistics, 1 + rank * DIFFICULTY_LEVELS // len(rows))
+                for rank, (text_id, statistics) in enumerate(rows)
+            ),
+        )
+        connection.execute(
+            "INSERT OR REPLACE INTO metadata_source VALUES ('data.db', ?)",
+            (database_signature(),),
+        )
+    return len(rows)
+
+
+def get_metadata_connection():
+    """Open cache database, building metadata if data.db changed since.
+
+    Returns:
+        sqlite3.Connection: Connection to cache database.
+    """
+    connection = connect_cache_database()
+    row = connection.execute(
+        "SELECT signature FROM metadata_source WHERE name = 'data.db'"
+    ).fetchone()
+    if row is None or row[0] != database_signature():
+        build_metadata(connection)
+    return connection
+
+
+def random_text_id(difficulty_level):
+    """Pick a random text of given difficulty.
+
+    Args:
+        difficulty_level (int): Difficulty level in range [1, 5].
+
+    Returns:
+        int: Row identifier of database text.
+    """
+    connection = get_metadata_connection()
+    try:
+        count = connection.execute(
+            "SELECT COUNT(*) FROM text_metadata WHERE difficulty = ?",
+            (difficulty_level,),
+        ).fetchone()[0]
+        return connection.execute(
+            "SELECT text_id FROM text_metadata WHERE difficulty = ? "
+            "ORDER BY text_id LIMIT 1 OFFSET ?",
+            (difficulty_level, random.randrange(count)),
+        ).fetchone()[0]
+    finally:
+        connection.close()
@@ -0,0 +1,108 @@
+"""Prepare neighbouring texts in the background."""
+
+import collections
+
+import mitype.database
+from mitype.calculations import squash_whitespace
+from mitype.layout import get_layout
+
+# Number of texts prepared on each side of the current text
+PREFETCH_COUNT = 2
+
+PreparedText = collections.namedtuple(
+    "PreparedText",
+    ["text", "layout"],
+)
+
+
+def prepare_text(text, width):
+    """Normalize and word wrap text.
+
+    Args:
+        text (str): Raw text.
+        width (int): Width to wrap around.
+
+    Returns:
+        PreparedText: Normalized text and its layout.
+    """
+    # Squash multiple spaces, tabs, newlines to single space
+    text = squash_whitespace(text)
+
+    return PreparedText(text, get_layout(text, width))
+
+
+def fetch_and_prepare_text(text_id, width):
+    """Fetch text from database and prepare it for given width.
+
+    Args:
+        text_id (int): Row identifier of database text.
+        width (int): Width to wrap around.
+
+    Returns:
+        PreparedText: Prepared text.
+    """
+    return prepare_text(mitype.database.fetch_text_from_id(text_id), width)
+
+
+class Prefetcher:
+    """Load and wrap the texts around the current one on a worker thread.
+
+    Switching to the previous or next text is then a lookup instead of a
+    database fetch followed by word wrapping.
+    """
+
+    def __init__(self, count=PREFETCH_COUNT):
+        """Initialize the prefetcher.
+
+        Args:
+            count (int): Number of texts to prepare on each side.
+        """
+        self.count = count
+        self.executor = None
+        # Maps (text ID, width) to the future of its prepared text
+        self.futures = {}
+
+    def schedule(self, text_id, width):
+        """Start preparing the texts surrounding given text.
+
+        Results no longer in range of the text are discarded.
+
+        Args:
+            text_id (int): Row identifier of current database text.
+            width (int): Width to wrap around.
+        """
+        if self.executor is None:
+            from concurrent.futures import ThreadPoolExecutor
+
+            self.executor = ThreadPoolExecutor(max_workers=1)
+
+        text_count = mitype.database.get_text_count()
+        wanted = []
+        for offset in range(1, self.count + 1):
+            for neighbour_id in (text_id + offset, text_id - offset):
+                if 1 <= neighbour_id <= text_count:
+                    wanted.append((neighbour_id, width))
+
+        for key in list(self.futures):
+            if key not in wanted:
+                self.futures.pop(key).cancel()
+
+        for key in wanted:
+            if key not in self.futures:
+                self.futures[key] = self.executor.submit(fetch_and_prepare_text, *key)
+
+    def get(self, text_id, width):
+        """Get a prepared text, waiting for it if it is still being prepared.
+
+        Args:
+            text_id (int): Row identifier of database text.
+            width (int): Width text was wrapped around.
+
+        Returns:
+            Union[PreparedText, None]: Prepared text or `None` if it was not
+            scheduled.
+        """
+        future = self.futures.get((text_id, width))
+        if future is None or future.cancelled():
+            return None
+        return future.result()
@@ -0,0 +1,129 @@
+"""Scheduling of keystrokes when replaying a session."""
+
+from array import array
+
+from mitype import timer
+
+# Keystrokes due within the same frame are played together
+REPLAY_FRAME_DURATION = timer.NANOSECONDS_PER_SECOND // 60
+
+# Playback speed multipliers available during replay
+REPLAY_SPEEDS = (0.5, 1, 2, 10)
+
+# Recorded time skipped by a single seek
+REPLAY_SEEK_STEP = 5 * timer.NANOSECONDS_PER_SECOND
+
+
+class ReplayScheduler:
+    """Decide which recorded keystrokes are due at a given time.
+
+    Playback is anchored to a monotonic clock. Each keystroke is due once
+    the recorded time elapsed since the first keystroke, scaled by the
+    playback speed, has passed.
+    """
+
+    def __init__(self, key_strokes, now, speed=1):
+        """Start playback of recorded keystrokes.
+
+        Args:
+            key_strokes (KeystrokeLog): Recorded keystrokes.
+            now (int): Current time in nanoseconds.
+            speed (float): Playback speed multiplier.
+        """
+        self.keys = [key for _, key in key_strokes]
+
+        # Recorded time of each keystroke since the first one
+        self.offsets = array("q")
+        for timestamp, _ in key_strokes:
+            self.offsets.append(timestamp - key_strokes.timestamps[0])
+
+        # Index of next keystroke to play
+        self.position = 0
+
+        self.speed = speed
+        # Time at which recorded time 0 is played
+        self.origin = now
+        # Time at which last batch of keystrokes was played
+        self.last_frame = now - REPLAY_FRAME_DURATION
+
+    def is_finished(self):
+        """Check if every keystroke has been played.
+
+        Returns:
+            bool: `True` if there is nothing left to play.
+        """
+        return self.position >= len(self.keys)
+
+    def recorded_time(self, now):
+        """Get position of playback in recorded time.
+
+        Args:
+            now (int): Current time in nanoseconds.
+
+        Returns:
+            int: Recorded time in nanoseconds.
+        """
+        return int((now - self.origin) * self.speed)
+
+    def next_frame_deadline(self):
+        """Get time at which next keystrokes are to be played.
+
+        Returns:
+            int: Time in nanoseconds.
+        """
+        next_key_time = self.origin + int(self.offsets[self.position] / self.speed)
+        return max(next_key_time, self.last_frame + REPLAY_FRAME_DURATION)
+
+    def due_keys(self, now):
+        """Get keystrokes due up to given time, in recorded order.
+
+        Args:
+            now (int): Current time in nanoseconds.
+
+        Returns:
+            list: Keys to play in this frame.
+        """
+        recorded_time = self.recorded_time(now)
+        start = self.position
+        while (
+            self.position < len(self.keys)
+            and self.offsets[self.position] <= recorded_time
+        ):
+            self.position += 1
+
+        self.last_frame = now
+        return self.keys[start : self.position]
+
+    def change_speed(self, step, now):
+        """Switch to the next slower or faster playback speed.
+
+        Args:
+            step (int): -1 for slower, 1 for faster.
+            now (int): Current time in nanoseconds.
+        """
+        recorded_time = self.recorded_time(now)
+        index = REPLAY_SPEEDS.index(self.speed) + step
+        self.speed = REPLAY_SPEEDS[max(0, min(index, len(REPLAY_SPEEDS) - 1))]
+        self.origin = now - int(recorded_time / self.speed)
+
+    def seek(self, offset, now):
+        """Move playback backwards or forwards in recorded time.
+
+        Keystrokes skipped forwards become due immediately. Seeking backwards
+        restarts playback from the first keystroke, so the caller has to clear
+        what was already played.
+
+        Args:
+            offset (int): Recorded time in nanoseconds to move by.
+            now (int): Current time in nanoseconds.
+
+        Returns:
+            bool: `True` if playback was restarted.
+        """
+        recorded_time = max(0, self.recorded_time(now) + offset)
+        self.origin = now - int(recorded_time / self.speed)
+
+        if offset < 0:
+            self.position = 0
+            return True
+        return False
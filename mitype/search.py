@@ -0,0 +1,166 @@
+"""Full-text search over database texts.
+
+The search index is built in the cache database on first use. SQLite's
+FTS5 extension is used when available, otherwise a plain table mapping
+each word to the texts containing it.
+"""
+
+import re
+
+import mitype.database
+import mitype.metadata
+
+# Maximum number of texts returned by a search
+SEARCH_RESULT_LIMIT = 20
+
+# Word as split by the fallback index
+SEARCH_TERM_PATTERN = re.compile(r"\w+")
+
+FTS_SCHEMA = """
+CREATE VIRTUAL TABLE text_search USING fts5(txt, content='');
+"""
+
+TERMS_SCHEMA = """
+CREATE TABLE text_search_terms (
+    term TEXT,
+    text_id INTEGER,
+    occurrences INTEGER
+);
+CREATE INDEX text_search_terms_term ON text_search_terms(term, text_id);
+"""
+
+FTS_QUERY = (
+    "SELECT rowid FROM text_search WHERE text_search MATCH ? ORDER BY rank LIMIT ?"
+)
+
+
+def search_terms(text):
+    """Split text into lowercase words for the fallback index.
+
+    Args:
+        text (str): Text to split.
+
+    Returns:
+        list: Words in order of appearance.
+    """
+    return SEARCH_TERM_PATTERN.findall(text.lower())
+
+
+def build_search_index(connection):
+    """Index every text of data.db in cache database.
+
+    Args:
+        connection (sqlite3.Connection): Connection to cache database.
+
+    Returns:
+        bool: `True` if an FTS5 index was built, `False` for the fallback.
+    """
+    import sqlite3
+
+    texts = mitype.database.fetch_all_texts()
+
+    connection.executescript(
+        "DROP TABLE IF EXISTS text_search; DROP TABLE IF EXISTS text_search_terms;"
+    )
+    try:
+        connection.executescript(FTS_SCHEMA)
+        uses_fts = True
+    except sqlite3.OperationalError:
+        # SQLite built without FTS5
+        connection.executescript(TERMS_SCHEMA)
+        uses_fts = False
+
+    with connection:
+        if uses_fts:
+            connection.executemany(
+                "INSERT INTO text_search (rowid, txt) VALUES (?, ?)", texts
+            )
+        else:
+            connection.executemany(
+                "INSERT INTO text_search_terms VALUES (?, ?, ?)",
+                (
+                    (term, text_id, occurrences)
+                    for text_id, text in texts
+                    for term, occurrences in count_terms(text).items()
+                ),
+            )
+        connection.execute(
+            "INSERT OR REPLACE INTO metadata_source VALUES ('text_search', ?)",
+            (mitype.metadata.database_signature(),),
+        )
+    return uses_fts
+
+
+def count_terms(text):
+    """Count occurrences of each word of a text.
+
+    Args:
+        text (str): Text to count words of.
+
+    Returns:
+        dict: Mapping of word to number of occurrences.
+    """
+    counts = {}
+    for term in search_terms(text):
+        counts[term] = counts.get(term, 0) + 1
+    return counts
+
+
+def get_search_connection():
+    """Open cache database, building search index if data.db changed since.
+
+    Returns:
+        (sqlite3.Connection, bool): Tuple of connection to cache database and
+        whether the index uses FTS5.
+    """
+    connection = mitype.metadata.connect_cache_database()
+    row = connection.execute(
+        "SELECT signature FROM metadata_source WHERE name = 'text_search'"
+    ).fetchone()
+
+    if row is None or row[0] != mitype.metadata.database_signature():
+        return connection, build_search_index(connection)
+
+    uses_fts = connection.execute(
+        "SELECT 1 FROM sqlite_master WHERE name = 'text_search'"
+    ).fetchone()
+    return connection, uses_fts is not None
+
+
+def search_texts(phrase, limit=SEARCH_RESULT_LIMIT):
+    """Find texts containing a phrase, best matches first.
+
+    With FTS5, texts must contain the words of the phrase in order and are
+    ranked by BM25. The fallback index finds texts containing every word,
+    ranked by how often the words occur.
+
+    Args:
+        phrase (str): Words to search for.
+        limit (int): Maximum number of texts to return.
+
+    Returns:
+        list: Row identifiers of matching database texts.
+    """
+    terms = search_terms(phrase)
+    if not terms:
+        return []
+
+    connection, uses_fts = get_search_connection()
+    try:
+        if uses_fts:
+            # Quote words so that the phrase is not parsed as FTS5 syntax
+            query = '"' + " ".join(terms) + '"'
+            rows = connection.execute(FTS_QUERY, (query, limit))
+        else:
+            unique_terms = sorted(set(terms))
+            placeholders = ", ".join("?" * len(unique_terms))
+            rows = connection.execute(
+                "SELECT text_id FROM text_search_terms "
+                f"WHERE term IN ({placeholders}) GROUP BY text_id "
+                "HAVING COUNT(*) = ? ORDER BY SUM(occurrences) DESC, text_id "
+                "LIMIT ?",
+                (*unique_terms, len(unique_terms), limit),
+            )
+        return [row[0] for row in rows]
+    finally:
+        connection.close()
@@ -9,4 +9,6 @@ def exit_on_signal(signum, frame):
     sys.exit(0)
 
 
-signal.signal(signal.SIGINT, exit_on_signal)
+def install_signal_handlers():
+    """Install custom signal handlers."""
+    signal.signal(signal.SIGINT, exit_on_signal)
@@ -0,0 +1,300 @@
+"""Incremental state of a typing session."""
+
+import re
+
+from mitype.calculations import first_index_at_which_strings_differ
+
+# Highest number of mistakes counted at a single position
+MAX_ERROR_COUNT = 255
+
+# Counter of a position with at least one mistake
+NONZERO_COUNT_PATTERN = re.compile(b"[^\x00]")
+
+
+class ErrorLedger:
+    """Positions of the text at which mistakes were typed.
+
+    Holds one counter per character of the text, so recording a mistake is
+    a constant time update however often the same character is mistyped.
+    """
+
+    def __init__(self, length):
+        """Initialize an empty ledger.
+
+        Args:
+            length (int): Length of the text.
+        """
+        self.counts = bytearray(length)
+
+    def record(self, index):
+        """Record a mistake at given position.
+
+        Args:
+            index (int): Index of mistyped character in text.
+        """
+        if self.counts[index] < MAX_ERROR_COUNT:
+            self.counts[index] += 1
+
+    def positions(self):
+        """Get positions at which mistakes were recorded.
+
+        Returns:
+            list: Indices in ascending order.
+        """
+        return [match.start() for match in NONZERO_COUNT_PATTERN.finditer(self.counts)]
+
+
+class TypingBuffer:
+    """Characters typed so far, split into finished text and current word.
+
+    Characters are kept in a list so appending and erasing do not copy what
+    was typed before. Positions of spaces typed inside the current word are
+    kept on a stack, so erasing the last word only touches that word. String
+    views are built on demand and cached until the next change.
+    """
+
+    def __init__(self):
+        """Initialize an empty buffer."""
+        self.chars = []
+
+        # Index of first character of the current word
+        self.word_start = 0
+
+        # Indices of spaces typed inside the current word
+        self.word_boundaries = []
+
+        self._string = ""
+        self._word = ""
+
+    def __len__(self):
+        """Get number of typed characters.
+
+        Returns:
+            int: Number of characters.
+        """
+        return len(self.chars)
+
+    def __getitem__(self, index):
+        """Get a typed character.
+
+        Args:
+            index (int): Index of character.
+
+        Returns:
+            str: Character.
+        """
+        return self.chars[index]
+
+    @property
+    def string(self):
+        """str: Entire typed string."""
+        if self._string is None:
+            self._string = "".join(self.chars)
+        return self._string
+
+    @property
+    def word(self):
+        """str: Typed characters of the current word."""
+        if self._word is None:
+            self._word = "".join(self.chars[self.word_start :])
+        return self._word
+
+    def word_length(self):
+        """Get number of characters in the current word.
+
+        Returns:
+            int: Length of the current word.
+        """
+        return len(self.chars) - self.word_start
+
+    def append(self, char):
+        """Append a character to the current word.
+
+        Args:
+            char (str): Typed character.
+        """
+        if char == " ":
+            self.word_boundaries.append(len(self.chars))
+        self.chars.append(char)
+        self._string = None
+        self._word = None
+
+    def end_word(self):
+        """Start a new, empty current word after what was typed."""
+        self.word_start = len(self.chars)
+        self.word_boundaries.clear()
+        self._word = ""
+
+    def pop(self):
+        """Remove the last character of the current word.
+
+        Returns:
+            str: Removed character.
+        """
+        char = self.chars.pop()
+        if self.word_boundaries and self.word_boundaries[-1] == len(self.chars):
+            self.word_boundaries.pop()
+        self._string = None
+        self._word = None
+        return char
+
+    def last_word_length(self):
+        """Get number of characters erased by deleting the last typed word.
+
+        That is everything after the last space of the current word including
+        the space itself, or the whole word if it holds no space.
+
+        Returns:
+            int: Number of characters.
+        """
+        if self.word_boundaries:
+            return len(self.chars) - self.word_boundaries[-1]
+        return self.word_length()
+
+
+class TypingState:
+    """Keep track of typed text and where it first diverges from the sample.
+
+    The mismatch index is updated on every append and erase rather than
+    being recomputed by comparing the whole typed string with the text.
+    """
+
+    def __init__(self, text):
+        """Initialize the typing state.
+
+        Args:
+            text (str): Sample text (word wrapped) the user has to type.
+        """
+        self.text = text
+
+        # Typed characters
+        self.buffer = TypingBuffer()
+
+        # Index at which the typed string first differs from text
+        # Equals length of the typed string (capped by text length)
+        # when there is no mismatch
+        self.mismatch_index = 0
+
+        # Number of whitespace separated words in the typed string
+        self.word_count = 0
+
+        # Mistakes made at each position of text
+        self.errors = ErrorLedger(len(text))
+
+    @property
+    def current_string(self):
+        """str: Entire typed string."""
+        return self.buffer.string
+
+    @property
+    def current_word(self):
+        """str: Typed characters of the current word."""
+        return self.buffer.word
+
+    def typed_length(self):
+        """Get number of typed characters without building the typed string.
+
+        Returns:
+            int: Length of the typed string.
+        """
+        return len(self.buffer)
+
+    def word_length(self):
+        """Get number of typed characters in the current word.
+
+        Returns:
+            int: Length of the current word.
+        """
+        return self.buffer.word_length()
+
+    def reset(self):
+        """Clear everything typed so far."""
+        self.buffer = TypingBuffer()
+        self.mismatch_index = 0
+        self.word_count = 0
+        self.errors = ErrorLedger(len(self.text))
+
+    def set_text(self, text):
+        """Replace sample text, keeping what was typed.
+
+        Used when the same text is wrapped again for a different width.
+        Positions of mistakes no longer match the text and are cleared.
+
+        Args:
+            text (str): New sample text.
+        """
+        self.text = text
+        self.errors = ErrorLedger(len(self.text))
+        self.mismatch_index = first_index_at_which_strings_differ(
+            self.current_string, self.text
+        )
+
+    def append(self, chars):
+        """Append typed characters to the current word.
+
+        Args:
+            chars (str): Characters to append.
+        """
+        buffer = self.buffer
+        for char in chars:
+            position = len(buffer)
+            if (
+                self.mismatch_index == position
+                and position < len(self.text)
+                and self.text[position] == char
+            ):
+                self.mismatch_index += 1
+            elif position < len(self.text):
+                # Typed at or after the first mismatch
+                self.errors.record(position)
+            if self.starts_word(char, position):
+                self.word_count += 1
+            buffer.append(char)
+
+    def accept_word(self, space_count):
+        """Finalize current word and skip the spaces following it.
+
+        Args:
+            space_count (int): Number of spaces after the word in text.
+        """
+        self.append(" " * space_count)
+        self.buffer.end_word()
+
+    def erase(self, count=1):
+        """Erase characters from the end of the current word.
+
+        Args:
+            count (int): Number of characters to erase.
+        """
+        buffer = self.buffer
+        for _ in range(min(count, buffer.word_length())):
+            char = buffer.pop()
+            if self.starts_word(char, len(buffer)):
+                self.word_count -= 1
+        self.mismatch_index = min(self.mismatch_index, len(buffer))
+
+    def erase_word(self):
+        """Erase the last typed word of the current word buffer."""
+        self.erase(self.buffer.last_word_length())
+
+    def starts_word(self, char, position):
+        """Check if a typed character is the first one of a word.
+
+        Args:
+            char (str): Typed character.
+            position (int): Index of character in typed string.
+
+        Returns:
+            bool: `True` if character starts a word.
+        """
+        if char.isspace():
+            return False
+        return position == 0 or self.buffer[position - 1].isspace()
+
+    def is_complete(self):
+        """Check if whole text has been typed correctly.
+
+        Returns:
+            bool: `True` if every character of text has been typed.
+        """
+        return self.mismatch_index == len(self.text)
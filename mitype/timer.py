@@ -1,7 +1,41 @@
-"""Timer."""
+"""Timer.
+
+All timing goes through this module. Times are integer nanoseconds read
+from a monotonic, high resolution clock, so they are not affected by
+system clock adjustments and do not accumulate floating point errors.
+"""
 
 import time
 
+NANOSECONDS_PER_MILLISECOND = 1_000_000
+NANOSECONDS_PER_SECOND = 1_000_000_000
+NANOSECONDS_PER_MINUTE = 60 * NANOSECONDS_PER_SECOND
+
+
+def now():
+    """Get current time.
+
+    Only differences between two values are meaningful.
+
+    Returns:
+        int: Current time in nanoseconds.
+    """
+    return time.perf_counter_ns()
+
+
+def milliseconds_until(deadline):
+    """Get time left until given time, rounded up to whole milliseconds.
+
+    Rounding up makes a wait for the deadline never wake up before it.
+
+    Args:
+        deadline (int): Time in nanoseconds as returned by `now`.
+
+    Returns:
+        int: Milliseconds left, 0 if deadline has passed.
+    """
+    return max(0, -((now() - deadline) // NANOSECONDS_PER_MILLISECOND))
+
 
 def get_elapsed_minutes_since_first_keypress(start_time):
     """Get time elapsed since initial keypress.
@@ -9,11 +43,11 @@ def get_elapsed_minutes_since_first_keypress(start_time):
     This is required to calculate speed.
 
     Args:
-        start_time (float): The time when user starts typing
+        start_time (int): The time in nanoseconds when user starts typing
             the sample text.
 
     Returns:
         float: Time elapsed since start of typing session till calling
         this function.
     """
-    return (time.time() - start_time) / 60
+    return (now() - start_time) / NANOSECONDS_PER_MINUTE
@@ -1,13 +1,36 @@
 """Setup script for mitype."""
 
+import os
+import sys
+
 from setuptools import setup
+from setuptools.command.build_py import build_py
 
 import versioneer
 
+
+class BuildPyWithCorpus(build_py):
+    """Build package along with the memory mapped corpus of data.db."""
+
+    def run(self):
+        """Build package and export data.db into the build directory."""
+        super().run()
+
+        # Import the package being built rather than an installed one
+        sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+        from mitype.database import CORPUS_FILENAME, build_corpus
+
+        package_directory = os.path.join(self.build_lib, "mitype")
+        build_corpus(
+            os.path.join(package_directory, CORPUS_FILENAME),
+            os.path.join(package_directory, "data.db"),
+        )
+
+
 if __name__ == "__main__":
     setup(
         version=versioneer.get_version(),
-        cmdclass=versioneer.get_cmdclass(),
+        cmdclass=versioneer.get_cmdclass({"build_py": BuildPyWithCorpus}),
         download_url="https://github.com/mithil467/mitype/archive/v%s.tar.gz"
         % versioneer.get_version(),
     )
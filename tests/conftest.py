@@ -2,10 +2,30 @@ from unittest.mock import MagicMock
 
 import pytest
 
-from mitype import app, commandline, history
+from mitype import app, commandline, history, metadata
 from mitype.database import fetch_text_from_id
 
 
+@pytest.fixture(autouse=True)
+def history_database_path(monkeypatch, tmp_path):
+    history_database = tmp_path / ".mitype_history.db"
+    monkeypatch.setattr(
+        history, "history_database_absolute_path", lambda: str(history_database)
+    )
+
+    return history_database
+
+
+@pytest.fixture(autouse=True)
+def cache_database_path(monkeypatch, tmp_path):
+    cache_database = tmp_path / ".mitype_cache.db"
+    monkeypatch.setattr(
+        metadata, "cache_database_absolute_path", lambda: str(cache_database)
+    )
+
+    return cache_database
+
+
 @pytest.fixture()
 def empty_history_file(monkeypatch, tmp_path):
     history_file = tmp_path / ".mitype_history.csv"
@@ -46,8 +66,9 @@ def mocked_app(mocked_curses, monkeypatch):
     monkeypatch.setattr(app, "resolve_commandline_arguments", lambda: (text, text_id))
 
     myapp = app.App()
+    win = MagicMock()
+    win.getmaxyx.return_value = (75, 274)
+    myapp.initialize(win)
     myapp.Color = MagicMock()
-    myapp.window_width = 274
-    myapp.window_height = 75
 
     return myapp
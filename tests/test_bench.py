@@ -0,0 +1,54 @@
+import json
+import pathlib
+
+from mitype import bench
+
+BASELINE = pathlib.Path(__file__).parent / "bench_baseline.json"
+
+# Metrics which do not depend on the speed of the machine
+OUTPUT_METRICS = ("bytes_per_key", "calls_per_key")
+
+
+def test_headless_window_counts_output():
+    win = bench.HeadlessWindow(10, 20)
+    win.addstr(0, 0, "abc")
+    win.addstr("é", 1)
+    win.move(1, 1)
+
+    assert win.calls == 3
+    assert win.bytes_written == 5
+
+
+def test_error_heavy_keys_type_the_text():
+    text = "the quick brown fox"
+    results = bench.run_scenarios(
+        {"errors": [(text, bench.error_heavy_keys(text, error_rate=0.5))]},
+        repeat=1,
+        trace_memory=False,
+    )
+
+    assert results["errors"]["keys"] > len(text)
+
+
+def test_output_per_keystroke_does_not_regress():
+    with BASELINE.open(encoding="utf-8") as file:
+        baseline = json.load(file)
+    baseline = {
+        "short": {metric: baseline["short"][metric] for metric in OUTPUT_METRICS}
+    }
+
+    scenarios = {"short": bench.default_scenarios()["short"]}
+    results = bench.run_scenarios(scenarios, repeat=1, trace_memory=False)
+
+    # Width of the realtime speed printed depends on typing speed
+    assert bench.find_regressions(results, baseline, tolerance=0.1) == []
+
+
+def test_saved_baseline_ends_with_newline(tmp_path):
+    path = tmp_path / "baseline.json"
+    bench.main(
+        ["--scenario", "short", "--repeat", "1", "--no-memory"]
+        + ["--save-baseline", str(path)]
+    )
+
+    assert path.read_text(encoding="utf-8").endswith("}\n")
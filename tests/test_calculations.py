@@ -0,0 +1,46 @@
+from mitype.calculations import (
+    consecutive_runs,
+    squash_whitespace,
+    text_chunks,
+    word_wrap,
+    word_wrap_with_line_starts,
+)
+
+
+def test_word_wrap_pads_line_breaks():
+    assert word_wrap("aaa bbb ccc", 6) == "aaa   bbb   ccc"
+
+
+def test_word_wrap_keeps_space_at_end_of_line():
+    assert word_wrap("aaaa bbbb", 5) == "aaaa bbbb"
+
+
+def test_word_wrap_splits_words_longer_than_line():
+    assert word_wrap("abcdefgh ij", 4) == "abcdefgh ij"
+
+
+def test_word_wrap_line_starts():
+    text, line_starts = word_wrap_with_line_starts("the quick brown fox", 8)
+
+    assert text == "the     quick   brown   fox"
+    assert list(line_starts) == [0, 8, 16, 24]
+
+
+def test_consecutive_runs():
+    assert consecutive_runs([]) == []
+    assert consecutive_runs([1, 2, 3, 7, 9, 10]) == [(1, 4), (7, 8), (9, 11)]
+
+
+def test_text_chunks_do_not_cut_words():
+    text = "lorem ipsum\tdolor  sit amet"
+    chunks = list(text_chunks(text, 4))
+
+    assert "".join(chunks) == text
+    assert chunks == ["lorem", " ipsum", "\tdolor", "  sit", " amet"]
+
+
+def test_squash_whitespace():
+    text = " the  quick\nbrown\t\tfox  "
+
+    assert squash_whitespace(text) == "the quick brown fox"
+    assert squash_whitespace("") == ""
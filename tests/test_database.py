@@ -0,0 +1,62 @@
+import sqlite3
+
+import pytest
+
+from mitype import database
+
+
+def test_fetch_text_from_id():
+    assert database.fetch_text_from_id(1) == "I love to type crazy stuff."
+
+
+def test_fetch_text_is_cached():
+    text = database.fetch_text_from_id(42)
+
+    assert database.fetch_text_from_id(42) is text
+
+
+def test_text_count():
+    assert database.get_text_count() == 6000
+
+
+def test_connection_is_shared_and_read_only():
+    connection = database.get_connection()
+
+    assert database.get_connection() is connection
+    with pytest.raises(sqlite3.OperationalError):
+        connection.execute("DELETE FROM data")
+
+
+@pytest.fixture()
+def corpus(monkeypatch, tmp_path):
+    corpus_path = tmp_path / database.CORPUS_FILENAME
+    database.build_corpus(str(corpus_path))
+    corpus = database.open_corpus(str(corpus_path))
+
+    monkeypatch.setattr(database, "_corpus", corpus)
+    monkeypatch.setattr(database, "_corpus_opened", True)
+    database.fetch_text_from_id.cache_clear()
+    yield corpus
+    database.fetch_text_from_id.cache_clear()
+
+
+def test_corpus_matches_database(corpus):
+    for serial_id in (1, 1758, 6000):
+        text = database.get_connection().execute(
+            database.FETCH_TEXT_QUERY, (serial_id,)
+        )
+        expected = " ".join(text.fetchone()[0].split())
+
+        assert database.read_corpus_text(corpus, serial_id) == expected
+        assert database.fetch_text_from_id(serial_id) == expected
+
+    assert database.read_corpus_text(corpus, 6001) is None
+
+
+def test_invalid_corpus_file_is_ignored(tmp_path):
+    corpus_path = tmp_path / database.CORPUS_FILENAME
+
+    assert database.open_corpus(str(corpus_path)) is None
+
+    corpus_path.write_bytes(b"not a corpus")
+    assert database.open_corpus(str(corpus_path)) is None
@@ -36,3 +36,38 @@ class TestGetHistoryRecords:
         records = history.get_history_records(10)
 
         assert len(records) == 10
+
+    @pytest.mark.parametrize("number_of_records", [0, 1, 10, 99, 100, 150])
+    def test_get_last_records_read_backwards(
+        self, history_file, monkeypatch, number_of_records
+    ):
+        monkeypatch.setattr(history, "HISTORY_BLOCK_SIZE", 7)
+        all_records = history.get_history_records(-1)
+
+        records = history.get_history_records(number_of_records)
+
+        assert records == all_records[max(0, len(all_records) - number_of_records) :]
+
+
+class TestHistoryDatabase:
+    def test_migrate_history(self, history_file):
+        assert history.migrate_history() == 100
+        assert history.uses_history_database()
+
+        records = history.get_history_records(10)
+        assert len(records) == 10
+        assert records[-1][0] == "99"
+
+    def test_migrate_history_only_once(self, history_file):
+        history.migrate_history()
+
+        assert history.migrate_history() == 0
+        assert len(history.get_history_records(-1)) == 100
+
+    def test_save_history_to_database(self, empty_history_file):
+        history.migrate_history()
+        history.save_history(7, "65.30", "89.00")
+
+        records = history.get_history_records(-1)
+        assert len(records) == 1
+        assert records[0][0] == "7"
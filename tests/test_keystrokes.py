@@ -0,0 +1,12 @@
+from mitype.keystrokes import KeystrokeLog
+
+
+def test_keystroke_log_round_trip():
+    keys = ["a", "KEY_BACKSPACE", "é", 530, "KEY_BACKSPACE", " "]
+    log = KeystrokeLog()
+    for timestamp, key in enumerate(keys):
+        log.append(timestamp * 10, key)
+
+    assert len(log) == len(keys)
+    assert list(log) == [(index * 10, key) for index, key in enumerate(keys)]
+    assert log.special_keys == ["KEY_BACKSPACE", 530]
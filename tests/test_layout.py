@@ -0,0 +1,74 @@
+import mitype.layout as layout_module
+from mitype.calculations import get_space_count_after_ith_word
+from mitype.layout import TextLayout, get_layout
+
+
+def test_token_offsets():
+    layout = TextLayout("the quick brown fox", 8)
+
+    assert layout.text == "the     quick   brown   fox"
+    assert [layout.token_span(index) for index in range(4)] == [
+        (0, 3),
+        (8, 13),
+        (16, 21),
+        (24, 27),
+    ]
+    assert layout.token(1) == "quick"
+    assert layout.longest_token_length == 5
+    assert layout.token_count() == 4
+
+
+def test_space_count_after_matches_scan():
+    layout = TextLayout("aaa bb c dddd eeeeeeeeee f", 6)
+
+    for token_index in range(layout.token_count()):
+        end = layout.token_span(token_index)[1]
+        assert layout.space_count_after(token_index) == (
+            get_space_count_after_ith_word(end, layout.text)
+        )
+
+
+def test_word_split_across_lines_is_one_token():
+    layout = TextLayout("abcdefgh ij", 4)
+
+    assert layout.token_count() == 2
+    assert layout.token_span(0) == (0, 8)
+    assert layout.line_of(5) == 1
+    assert layout.line_of(layout.token_span(1)[0]) == 2
+
+
+def test_layout_is_reused_for_same_text_and_width():
+    layout = get_layout("the quick brown fox", 8)
+
+    assert get_layout("the quick brown fox", 8) is layout
+    assert get_layout("the quick brown fox", 9) is not layout
+    assert get_layout("the quick brown fox", 9).text == "the      quick    brown fox"
+
+
+def test_long_text_is_indexed_in_chunks(monkeypatch):
+    monkeypatch.setattr(layout_module, "TEXT_CHUNK_SIZE", 16)
+    text = " ".join(f"word{index}" for index in range(100))
+    layout = TextLayout(text, 30)
+
+    assert layout.token_count() == 100
+    assert layout.token(99) == "word99"
+    assert [layout.token(index) for index in range(100)] == text.split()
+
+
+def test_layout_cache_is_bounded_by_characters(monkeypatch):
+    monkeypatch.setattr(layout_module, "LAYOUT_CACHE_CHARACTERS", 100)
+    monkeypatch.setattr(layout_module, "_layouts", layout_module._layouts.copy())
+    layout_module._layouts.clear()
+    monkeypatch.setattr(layout_module, "_layouts_characters", 0)
+
+    text = "lorem ipsum dolor sit amet"
+    first = get_layout(text, 10)
+    assert get_layout(text, 10) is first
+
+    get_layout(text, 11)
+    get_layout(text, 12)
+    assert get_layout(text, 10) is not first
+    assert layout_module._layouts_characters <= 100
+
+    long_text = " ".join(["word"] * 30)
+    assert get_layout(long_text, 10) is not get_layout(long_text, 10)
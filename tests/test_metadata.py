@@ -0,0 +1,60 @@
+import random
+
+from mitype import commandline, metadata
+
+
+def test_text_statistics():
+    statistics = metadata.text_statistics("Call 911, now!")
+
+    assert statistics[:3] == (14, 3, 4)
+    assert statistics[3] == 2 / 14
+    assert statistics[4] == 3 / 14
+
+
+def test_difficulty_levels_have_equal_size():
+    connection = metadata.get_metadata_connection()
+    rows = connection.execute(
+        "SELECT difficulty, COUNT(*), AVG(char_count) FROM text_metadata "
+        "GROUP BY difficulty ORDER BY difficulty"
+    ).fetchall()
+    connection.close()
+
+    assert [row[0] for row in rows] == [1, 2, 3, 4, 5]
+    assert {row[1] for row in rows} == {1200}
+    average_lengths = [row[2] for row in rows]
+    assert average_lengths == sorted(average_lengths)
+
+
+def test_metadata_is_built_once(monkeypatch):
+    metadata.get_metadata_connection().close()
+
+    def fail(connection):
+        raise AssertionError("metadata built again")
+
+    monkeypatch.setattr(metadata, "build_metadata", fail)
+    metadata.get_metadata_connection().close()
+
+
+def test_metadata_is_rebuilt_when_database_changes(monkeypatch):
+    metadata.get_metadata_connection().close()
+    monkeypatch.setattr(metadata, "database_signature", lambda: "changed")
+
+    connection = metadata.get_metadata_connection()
+    signature = connection.execute("SELECT signature FROM metadata_source").fetchone()
+    connection.close()
+
+    assert signature == ("changed",)
+
+
+def test_load_based_on_difficulty():
+    random.seed(0)
+    text, text_id = commandline.load_based_on_difficulty(1)
+
+    connection = metadata.get_metadata_connection()
+    difficulty = connection.execute(
+        "SELECT difficulty FROM text_metadata WHERE text_id = ?", (text_id,)
+    ).fetchone()[0]
+    connection.close()
+
+    assert difficulty == 1
+    assert text
@@ -0,0 +1,30 @@
+from mitype.database import fetch_text_from_id
+from mitype.prefetch import Prefetcher, prepare_text
+
+
+def test_prepare_text():
+    prepared = prepare_text("the  quick\nbrown fox", 8)
+
+    assert prepared.text == "the quick brown fox"
+    assert prepared.layout.text == "the     quick   brown   fox"
+    assert list(prepared.layout.line_starts) == [0, 8, 16, 24]
+
+
+def test_prefetcher_prepares_neighbours():
+    prefetcher = Prefetcher(count=1)
+    prefetcher.schedule(10, 80)
+
+    prepared = prefetcher.get(11, 80)
+    assert prepared.text == " ".join(fetch_text_from_id(11).split())
+    assert prefetcher.get(9, 80) is not None
+
+    assert prefetcher.get(12, 80) is None
+    assert prefetcher.get(11, 40) is None
+
+
+def test_prefetcher_skips_ids_out_of_range():
+    prefetcher = Prefetcher(count=1)
+    prefetcher.schedule(1, 80)
+
+    assert prefetcher.get(0, 80) is None
+    assert prefetcher.get(2, 80) is not None
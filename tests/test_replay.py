@@ -0,0 +1,62 @@
+from mitype import timer
+from mitype.keystrokes import KeystrokeLog
+from mitype.replay import REPLAY_FRAME_DURATION, ReplayScheduler
+
+SECOND = timer.NANOSECONDS_PER_SECOND
+
+
+def make_log(*times_and_keys):
+    log = KeystrokeLog()
+    for timestamp, key in times_and_keys:
+        log.append(timestamp, key)
+    return log
+
+
+def test_due_keys_follow_recorded_time():
+    log = make_log((1000, "a"), (1000 + SECOND, "b"), (1000 + 3 * SECOND, "c"))
+    scheduler = ReplayScheduler(log, now=0)
+
+    assert scheduler.due_keys(0) == ["a"]
+    assert scheduler.next_frame_deadline() == SECOND
+    assert scheduler.due_keys(SECOND // 2) == []
+    assert scheduler.due_keys(2 * SECOND) == ["b"]
+    assert scheduler.due_keys(3 * SECOND) == ["c"]
+    assert scheduler.is_finished()
+
+
+def test_keys_within_a_frame_are_coalesced():
+    log = make_log((0, "a"), (1000, "b"), (2000, "c"))
+    scheduler = ReplayScheduler(log, now=0)
+
+    assert scheduler.due_keys(5000) == ["a", "b", "c"]
+
+
+def test_frames_are_rate_limited():
+    log = make_log((0, "a"), (REPLAY_FRAME_DURATION // 2, "b"))
+    scheduler = ReplayScheduler(log, now=0)
+    scheduler.due_keys(0)
+
+    assert scheduler.next_frame_deadline() == REPLAY_FRAME_DURATION
+
+
+def test_change_speed_keeps_position():
+    log = make_log((0, "a"), (10 * SECOND, "b"))
+    scheduler = ReplayScheduler(log, now=0)
+    scheduler.due_keys(0)
+
+    scheduler.change_speed(1, 5 * SECOND)
+
+    assert scheduler.speed == 2
+    assert scheduler.next_frame_deadline() == 5 * SECOND + 5 * SECOND // 2
+
+
+def test_seek():
+    log = make_log((0, "a"), (SECOND, "b"), (10 * SECOND, "c"))
+    scheduler = ReplayScheduler(log, now=0)
+    scheduler.due_keys(0)
+
+    assert not scheduler.seek(20 * SECOND, 0)
+    assert scheduler.due_keys(0) == ["b", "c"]
+
+    assert scheduler.seek(-15 * SECOND, 0)
+    assert scheduler.due_keys(0) == ["a", "b"]
@@ -0,0 +1,42 @@
+from mitype import commandline, search
+
+
+def test_search_finds_phrase():
+    assert search.search_texts("love to type crazy")[0] == 1
+
+
+def test_search_ignores_query_syntax():
+    assert search.search_texts('crazy" (stuff*') == [1]
+    assert search.search_texts(" ?! ") == []
+
+
+def test_search_index_is_built_once(monkeypatch):
+    search.search_texts("crazy stuff")
+
+    def fail(connection):
+        raise AssertionError("search index built again")
+
+    monkeypatch.setattr(search, "build_search_index", fail)
+    assert search.search_texts("crazy stuff") == [1]
+
+
+def test_search_without_fts5(monkeypatch):
+    monkeypatch.setattr(
+        search,
+        "FTS_SCHEMA",
+        "CREATE VIRTUAL TABLE text_search USING missing_module(txt);",
+    )
+
+    connection, uses_fts = search.get_search_connection()
+    connection.close()
+
+    assert not uses_fts
+    assert 1 in search.search_texts("type crazy stuff")
+
+
+def test_show_search_results(capsys):
+    commandline.show_search_results("crazy stuff")
+    assert capsys.readouterr().out == "    1  I love to type crazy stuff.\n"
+
+    commandline.show_search_results("zzzzqqq")
+    assert capsys.readouterr().out == "No text found for: zzzzqqq\n"
@@ -0,0 +1,49 @@
+import subprocess
+import sys
+
+import pytest
+
+# Generous upper bound on cumulative import time, in microseconds
+STARTUP_BUDGET = 250_000
+
+
+def import_times(module):
+    """Import module in a fresh interpreter and return import times by module."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|")
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+@pytest.mark.parametrize(
+    "module, deferred_modules",
+    [
+        (
+            "mitype.commandline",
+            [
+                "curses",
+                "sqlite3",
+                "webbrowser",
+                "concurrent.futures",
+                "mitype._version",
+            ],
+        ),
+        ("mitype.app", ["webbrowser", "concurrent.futures", "mitype._version"]),
+    ],
+)
+def test_startup_imports(module, deferred_modules):
+    times = import_times(module)
+
+    for deferred_module in deferred_modules:
+        assert deferred_module not in times
+    assert times[module] < STARTUP_BUDGET
@@ -0,0 +1,115 @@
+from mitype.calculations import first_index_at_which_strings_differ
+from mitype.state import TypingBuffer, TypingState
+
+
+def test_mismatch_index_follows_appends_and_erases():
+    state = TypingState("hello world")
+
+    state.append("help")
+    assert state.mismatch_index == 3
+    assert state.mismatch_index < state.typed_length()
+
+    state.erase()
+    assert state.mismatch_index == 3
+    assert state.mismatch_index == state.typed_length()
+
+    state.append("lo")
+    assert state.mismatch_index == 5
+
+
+def test_mismatch_index_matches_full_scan():
+    text = "the quick   brown fox"
+    state = TypingState(text)
+    typed = ""
+
+    for key in "thw\b\bhe quick\b\b\bick  x\bbrown":
+        if key == "\b":
+            state.erase()
+            typed = typed[:-1]
+        else:
+            state.append(key)
+            typed += key
+        assert state.current_string == typed
+        assert state.mismatch_index == first_index_at_which_strings_differ(typed, text)
+        assert state.word_count == len(typed.split())
+
+
+def test_erase_word():
+    state = TypingState("hello world")
+    state.append("hello")
+    state.erase_word()
+
+    assert state.current_string == ""
+    assert state.mismatch_index == 0
+
+
+def test_accept_word_and_complete():
+    state = TypingState("ab  cd")
+    state.append("ab")
+    state.accept_word(2)
+    state.append("cd")
+
+    assert state.current_word == "cd"
+    assert state.is_complete()
+
+
+def test_word_count():
+    state = TypingState("ab  cd ef")
+    state.append("ab")
+    state.accept_word(2)
+    state.append("cd x")
+    assert state.word_count == 3
+
+    state.erase_word()
+    assert state.word_count == 2
+
+    state.erase_word()
+    assert state.word_count == 1
+
+
+def test_error_ledger_counts_each_position_once():
+    state = TypingState("abc")
+    for _ in range(3):
+        state.append("x")
+        state.erase()
+    state.append("ay")
+
+    assert state.errors.positions() == [0, 1]
+    assert state.errors.counts[0] == 3
+    assert state.errors.counts[1] == 1
+
+
+def test_error_ledger_ignores_keys_typed_past_text():
+    state = TypingState("ab")
+    state.append("axyz")
+
+    assert state.errors.positions() == [1]
+
+
+def test_typing_buffer_views_follow_changes():
+    buffer = TypingBuffer()
+    for char in "ab":
+        buffer.append(char)
+    buffer.end_word()
+    for char in "c d":
+        buffer.append(char)
+
+    assert buffer.string == "abc d"
+    assert buffer.word == "c d"
+    assert buffer.last_word_length() == 2
+
+    assert buffer.pop() == "d"
+    assert buffer.pop() == " "
+    assert buffer.string == "abc"
+    assert buffer.word == "c"
+    assert buffer.last_word_length() == 1
+
+
+def test_erase_word_stops_at_typed_space():
+    state = TypingState("ab cd")
+    state.append("ab xy")
+    state.erase_word()
+
+    assert state.current_word == "ab"
+    assert state.typed_length() == 2
+    assert state.word_length() == 2
@@ -0,0 +1,22 @@
+from mitype import timer
+
+
+def test_now_is_monotonic_nanoseconds():
+    first = timer.now()
+    second = timer.now()
+
+    assert isinstance(first, int)
+    assert second >= first
+
+
+def test_elapsed_minutes():
+    start_time = timer.now() - 30 * timer.NANOSECONDS_PER_SECOND
+
+    assert 0.5 <= timer.get_elapsed_minutes_since_first_keypress(start_time) < 0.6
+
+
+def test_milliseconds_until_rounds_up():
+    deadline = timer.now() + timer.NANOSECONDS_PER_MILLISECOND // 2
+
+    assert timer.milliseconds_until(deadline) == 1
+    assert timer.milliseconds_until(timer.now() - timer.NANOSECONDS_PER_SECOND) == 0
@@ -28,3 +28,49 @@ def test_same_character_after_typing(mocked_app):
     for character in copy(text):
         mocked_app.typing_mode(win, character)
     assert mocked_app.accuracy == 100
+
+
+def test_keys_read_together_are_drawn_once(mocked_app):
+    win = MagicMock()
+    mocked_app.update_state = MagicMock(wraps=mocked_app.update_state)
+
+    keys = [(character, index) for index, character in enumerate(mocked_app.text)]
+    mocked_app.handle_keys(win, keys)
+
+    assert mocked_app.accuracy == 100
+    assert mocked_app.update_state.call_count == 1
+    assert len(mocked_app.key_strokes) == len(keys)
+
+
+def test_wrong_key_repaints_only_its_cell(mocked_app):
+    win = MagicMock()
+    for character in "zzzz":
+        mocked_app.typing_mode(win, character)
+
+    mocked_app.print_text_runs = MagicMock()
+    mocked_app.typing_mode(win, "z")
+
+    mocked_app.print_text_runs.assert_called_once_with(
+        win, [(4, 5, mocked_app.Color.RED)]
+    )
+
+
+def test_text_taller_than_window_scrolls(mocked_app):
+    win = MagicMock()
+    win.getmaxyx.return_value = (14, 40)
+    mocked_app.initialize(win)
+
+    assert mocked_app.viewport_height == 3
+    assert len(mocked_app.layout.line_starts) > 3
+
+    # Type all but the last line
+    typed = len(mocked_app.text_backup) - 40
+    for character in mocked_app.text_backup[:typed]:
+        mocked_app.typing_mode(win, character)
+    typed_length = mocked_app.state.typed_length()
+    assert mocked_app.viewport_top > 0
+    assert mocked_app.visible_start <= typed_length < mocked_app.visible_end
+
+    for character in mocked_app.text_backup[typed:]:
+        mocked_app.typing_mode(win, character)
+    assert mocked_app.accuracy == 100